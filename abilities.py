@@ -1,5 +1,6 @@
 import pygame
 from abc import ABC, abstractmethod
+from combat import strike
 
 class Abilities(ABC):
     def __init__(self, name, mana_cost, cooldown, ability_type, attack=0, defense=0, description="",attack_radius=3,is_aoe=0,damage_type="physical"):
@@ -26,8 +27,10 @@ class Abilities(ABC):
 
 
 
-    def get_targets_in_aoe(self, user, units):
-        """Get all units within AoE radius."""
+    def get_targets_in_aoe(self, user, units, occupancy=None):
+        """Get all units within AoE radius (looked up by tile when an OccupancyIndex is given)."""
+        if occupancy is not None:
+            return [unit for unit in occupancy.within(user.target_x, user.target_y, self.is_aoe) if unit != user]
         aoe_targets = []
         for unit in units:
             if unit.alive and unit!=user:
@@ -42,16 +45,26 @@ class Abilities(ABC):
     def apply_effect(self, user, target):
         """Apply the ability's effect to the target."""
         if target is None:
-            print("No valid target to apply effect.")
+            user.console("No valid target to apply effect.")
             return 
         
+        hit = self.effect_hit(user, target)
+        if hit is not None:
+            user.attack(target, hit[2], hit[3])
+
+
+
+
+    def effect_hit(self, user, target):
+        """The hit (user, target, raw damage, damage type) the ability makes on target, or None if it has no effect."""
         if self.ability_type == "damage" and user.color != target.color:
-            print(f"{target.name} takes {self.attack} damage!")
-            user.attack(target, self.attack+user.damage,self.damage_type)
+            user.console(f"{target.name} takes {self.attack} damage!")
+            return user, target, self.attack+user.damage, self.damage_type
         elif self.ability_type == "heal" and user.color == target.color:
             heal_amount = min(target.max_health - target.health, self.attack)
-            print(f"{target.name} is healed by {heal_amount} health!")
-            user.attack(target, -heal_amount)
+            user.console(f"{target.name} is healed by {heal_amount} health!")
+            return user, target, -heal_amount, "physical"
+        return None
 
 
 
@@ -81,12 +94,12 @@ class BuffAbility(Abilities):
 
     def use(self, user, target=None):
         if self.remaining_cooldown > 0:
-            print(f"{self.name} is on cooldown!")
+            user.console(f"{self.name} is on cooldown!")
             return False
 
         target = target or user  
         if target.color != user.color:  # Si la cible est un ennemi
-            print(f"{self.name}: You cannot use this ability on an enemy!")
+            user.console(f"{self.name}: You cannot use this ability on an enemy!")
             return False
         if not target.is_buffed :
             if self.attack:
@@ -99,12 +112,12 @@ class BuffAbility(Abilities):
             target.is_buffed=True
             target.buff_duration = self.duration 
         else :
-            print(f"{target.name} is already buffed")
+            user.console(f"{target.name} is already buffed")
             return False
 
      
 
-        print(f"{self.name}: {target.name} is buffed for 5 turns!")
+        user.console(f"{self.name}: {target.name} is buffed for 5 turns!")
         user.mana -= self.mana_cost
         self.remaining_cooldown = self.cooldown
         return True
@@ -124,15 +137,15 @@ class DebuffAbility(Abilities):
 
     def use(self, user, target=None):
         if self.remaining_cooldown > 0:
-            print(f"{self.name} is on cooldown!")
+            user.console(f"{self.name} is on cooldown!")
             return False
 
         if target is None:
-            print(f"{self.name}: No valid target to debuff!")
+            user.console(f"{self.name}: No valid target to debuff!")
             return False
         
         if target.color == user.color:
-            print(f"{self.name}: You cannot use this on an ally!")
+            user.console(f"{self.name}: You cannot use this on an ally!")
             return False
         
         if not target.is_debuffed:
@@ -146,11 +159,11 @@ class DebuffAbility(Abilities):
             target.is_debuffed=True
             target.debuff_duration = self.duration
         else:
-            print(f"{target.name} is already debuffed")
+            user.console(f"{target.name} is already debuffed")
             return False
 
 
-        print(f"{self.name}: {target.name} is debuffed for 5 turns!")
+        user.console(f"{self.name}: {target.name} is debuffed for 5 turns!")
         user.mana -= self.mana_cost
         self.remaining_cooldown = self.cooldown
         return True
@@ -174,22 +187,22 @@ class DamageHealAbility(Abilities):
         :param grid: Grid object to calculate AoE range.
         """
         if user.mana < self.mana_cost:
-            print(f"Not enough mana to use {self.name}.")
+            user.console(f"Not enough mana to use {self.name}.")
             return False
         if self.remaining_cooldown > 0:
-            print(f"{self.name} is on cooldown.")
+            user.console(f"{self.name} is on cooldown.")
             return False
 
         
         if targets is not None:
-            print(f"{user.name} uses {self.name} on multiple targets!")
+            user.console(f"{user.name} uses {self.name} on multiple targets!")
         if self.is_aoe>0:
-            for target in targets:
-                self.apply_effect(user, target)
-                print(target.name)
+            # Every target is hit at once, with the same rolls and results as one apply_effect per target
+            hits = [self.effect_hit(user, target) for target in targets]
+            strike([hit for hit in hits if hit is not None])
         else :
             self.apply_effect(user, targets)
-            print(targets.name)
+            user.console(targets.name)
 
         
 
@@ -0,0 +1,683 @@
+"""
+AI players - Policies that choose a whole turn for a unit, and the driver that plays it through Engine actions
+
+A turn plan is a tuple (destination, ability_index, target):
+    destination     tile to end the move on
+    ability_index   ability to use, or None for a basic attack
+    target          tile to put the attack cursor on (the destination itself when there is nothing to hit)
+"""
+import math
+import time
+import random
+import signal
+import multiprocessing
+from collections import deque
+from engine import Engine, create_roster
+from state import MatchState, capture, restore
+from transposition import ZobristHasher, TranspositionTable, EXACT, LOWER, UPPER
+from rng import RandomService
+from constants import Gameplay
+
+# Position evaluation weights, in units of "one living player at full health"
+KEY_VALUE = 0.6  # Each enemy key held
+BARRIER_VALUE = 2  # Enemy barrier down
+NEXUS_VALUE = 4  # Times the fraction of the enemy Nexus' health taken
+EVALUATION_SCALE = 3  # Score difference that maps to a ~88% estimated win chance
+
+
+
+
+def distance(a, b):
+    """Manhattan distance between two tiles."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+
+
+def destinations(engine, unit):
+    """Tiles the unit may end its move on: reachable this turn and not held by another living unit."""
+    occupancy = engine.occupancy
+    return [tile for tile in sorted(engine.grid.reachable_tiles(unit.initial_x, unit.initial_y, unit.move_range))
+            if occupancy.first_at(tile[0], tile[1], exclude=unit) is None]
+
+
+
+
+def can_hit(unit, target):
+    """Whether an attack on `target` can change anything (bases behind their barrier take no damage)."""
+    return target.color != unit.color and not (target.unit_type == "base" and target.barrier_status == "Up")
+
+
+
+
+def usable_abilities(unit):
+    """(index, ability) for each ability off cooldown that the unit has the mana for."""
+    return [(index, ability) for index, ability in enumerate(unit.abilities)
+            if ability.remaining_cooldown == 0 and unit.mana >= ability.mana_cost]
+
+
+
+
+def candidate_plans(engine, unit):
+    """
+    Every plan worth considering for the unit's turn; each destination also gets a plain "wait" plan.
+    A unit with no free tile to end its move on only gets to wait where its turn started (and pass).
+    """
+    plans = []
+    abilities = usable_abilities(unit)
+    occupancy = engine.occupancy
+    for destination in destinations(engine, unit) or [(unit.initial_x, unit.initial_y)]:
+        x, y = destination
+        plans.append((destination, None, destination))
+        for other in occupancy.within(x, y, unit.attack_range):
+            if other is not unit and can_hit(unit, other):
+                plans.append((destination, None, (other.x, other.y)))
+        for index, ability in abilities:
+            for other in occupancy.within(x, y, ability.attack_radius):
+                if ability.ability_type in ("heal", "buff"):
+                    useful = other.color == unit.color and other.unit_type == "player"
+                else:
+                    useful = can_hit(unit, other)
+                if useful:
+                    plans.append((destination, index, (other.x, other.y)))
+    return plans
+
+
+
+
+def path_to(engine, unit, destination):
+    """Unit steps (dx, dy) from the unit's tile to `destination`, through tiles reachable this turn."""
+    reachable = engine.grid.reachable_tiles(unit.initial_x, unit.initial_y, unit.move_range)
+    start = (unit.x, unit.y)
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        tile = queue.popleft()
+        if tile == destination:
+            break
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            step = (tile[0] + dx, tile[1] + dy)
+            if step in reachable and step not in previous:
+                previous[step] = tile
+                queue.append(step)
+    if destination not in previous:
+        return []
+    steps = []
+    tile = destination
+    while previous[tile] is not None:
+        before = previous[tile]
+        steps.append((tile[0] - before[0], tile[1] - before[1]))
+        tile = before
+    steps.reverse()
+    return steps
+
+
+
+
+def aim(unit, target):
+    """Actions walking the attack cursor from the unit to `target` (never leaving range on the way, if target is in range)."""
+    for axis in (0, 1):
+        while (unit.target_x, unit.target_y)[axis] != target[axis]:
+            before = (unit.target_x, unit.target_y)
+            step = 1 if target[axis] > before[axis] else -1
+            yield ("move_target", step, 0) if axis == 0 else ("move_target", 0, step)
+            if (unit.target_x, unit.target_y) == before:
+                return  # Out of range or off the grid
+
+
+
+
+def turn_actions(engine, unit, plan):
+    """
+    Engine actions playing a plan for the current unit, through to end_turn. It is a generator: each action
+    must be applied before the next one is asked for, since later steps depend on how the earlier ones went.
+    A unit that cannot finish its move anywhere ends its turn right away (see Engine.stuck).
+    """
+    destination, ability_index, target = plan
+    fallbacks = [(unit.initial_x, unit.initial_y)] + sorted(destinations(engine, unit),
+                                                            key=lambda tile: distance(tile, destination))
+    for tile in [destination] + fallbacks:
+        # When the tile was taken after all, try where the turn started, then the free tiles nearest the plan's
+        for dx, dy in path_to(engine, unit, tile):
+            yield ("move", dx, dy)
+        yield ("confirm_move",)
+        if unit.state != "move":
+            break
+    else:
+        yield ("end_turn",)
+        return
+
+    if unit.state == "attack" and ability_index is not None:
+        yield ("select_ability", ability_index)
+        yield from aim(unit, target)
+        yield ("attack",)
+    if unit.state == "attack":
+        # Basic attack, also the fallback when the ability could not be used
+        yield ("select_ability", None)
+        if distance((unit.x, unit.y), target) <= unit.attack_range:
+            yield from aim(unit, target)
+        yield ("attack",)
+    yield ("end_turn",)
+
+
+
+
+def execute(engine, unit, plan):
+    """
+    Play a plan for the current unit straight away.
+    :return: (events, stalled); stalled is True when the turn could not be ended, which leaves the match stuck.
+    """
+    events = []
+    turn = engine.current_turn
+    for action in turn_actions(engine, unit, plan):
+        events += engine.apply_action(action)
+    return events, engine.winner is None and engine.current_turn == turn
+
+
+
+
+def take_turn(engine, policy):
+    """Let `policy` choose and play the current unit's turn. Returns (events, stalled)."""
+    unit = engine.current_unit()
+    return execute(engine, unit, policy.choose(engine, unit))
+
+
+
+
+def effective_damage(target, amount, damage_type="physical"):
+    """Damage after the target's defense, ignoring critical hits."""
+    defense = target.physical_defense if damage_type == "physical" else target.magical_defense
+    return int(amount * (1 - defense / (defense + 100)))
+
+
+
+
+def kill_value(target):
+    """How much taking `target` down is worth to the attacking team."""
+    if target.unit_type == "base":
+        return 10000
+    keys = target.red_keys + target.blue_keys
+    if target.unit_type == "monster":
+        return 40 + 120 * keys
+    return 100 + 150 * keys
+
+
+
+
+def objective(engine, unit):
+    """Tile the unit should head for: the enemy Nexus once its barrier is down, else the nearest key holder."""
+    enemy = "red" if unit.color == "blue" else "blue"
+    for other in engine.units:
+        if other.unit_type == "base" and other.color == enemy and other.alive and other.barrier_status == "Down":
+            return other.x, other.y
+    holders = [other for other in engine.units if other.alive and other.color != unit.color
+               and (other.red_keys if unit.color == "blue" else other.blue_keys)]
+    if not holders:
+        holders = [other for other in engine.units if other.alive and other.color == enemy and other.unit_type == "player"]
+    if not holders:
+        return unit.x, unit.y
+    nearest = min(holders, key=lambda other: distance((unit.x, unit.y), (other.x, other.y)))
+    return nearest.x, nearest.y
+
+
+
+
+def evaluate(engine, team):
+    """Estimated chance that `team` wins from the current position, between 0 and 1."""
+    if engine.winner is not None:
+        return 1.0 if engine.winner == team else 0.0
+    score = 0.0
+    for unit in engine.units:
+        sign = 1 if unit.color == team else -1
+        if unit.unit_type == "player":
+            enemy_keys = unit.red_keys if unit.color == "blue" else unit.blue_keys
+            if unit.alive:
+                score += sign * (1 + unit.health / unit.max_health)
+            score += sign * KEY_VALUE * enemy_keys
+        elif unit.unit_type == "base" and unit.barrier_status == "Down":
+            score -= sign * (BARRIER_VALUE + NEXUS_VALUE * (1 - unit.health / unit.max_health))
+    return 0.5 + 0.5 * math.tanh(score / EVALUATION_SCALE)
+
+
+
+
+class RandomPolicy:
+    """Picks uniformly among the candidate plans."""
+    name = "random"
+
+    def __init__(self, rng):
+        self.rng = rng  # random.Random the policy draws from
+
+
+
+
+    def choose(self, engine, unit):
+        return self.rng.choice(candidate_plans(engine, unit))
+
+
+
+
+class GreedyPolicy:
+    """
+    One-turn lookahead: scores every plan by the damage, kills, keys and healing it should bring, minus the
+    distance still left to the unit's objective, and plays the best one (ties broken at random).
+    """
+    name = "greedy"
+    APPROACH_WEIGHT = 3  # Score lost per tile between the destination and the objective
+    STATUS_VALUE = 30  # Score of a buff on an ally or a debuff on an enemy that has none
+
+    def __init__(self, rng):
+        self.rng = rng
+
+
+
+
+    def score(self, engine, unit, plan, goal):
+        """Expected gain of a plan for a unit heading to the tile `goal`."""
+        destination, ability_index, target_tile = plan
+        score = -self.APPROACH_WEIGHT * distance(destination, goal)
+        targets = [other for other in engine.occupancy.at(*target_tile) if other is not unit]
+        if ability_index is None:
+            for target in targets:
+                if can_hit(unit, target):
+                    damage = effective_damage(target, unit.damage)
+                    score += min(damage, target.health) + (kill_value(target) if damage >= target.health else 0)
+                    break
+            return score
+
+        ability = unit.abilities[ability_index]
+        if ability.is_aoe:
+            targets = [other for other in engine.occupancy.within(target_tile[0], target_tile[1], ability.is_aoe)
+                       if other is not unit]
+        elif targets:
+            targets = targets[:1]
+        for target in targets:
+            if ability.ability_type == "damage" and can_hit(unit, target):
+                damage = effective_damage(target, ability.attack + unit.damage, ability.damage_type)
+                score += min(damage, target.health) + (kill_value(target) if damage >= target.health else 0)
+            elif ability.ability_type == "heal" and target.color == unit.color:
+                score += min(target.max_health - target.health, ability.attack)
+            elif ability.ability_type == "buff" and target.color == unit.color and not target.is_buffed:
+                score += self.STATUS_VALUE
+            elif ability.ability_type == "debuff" and can_hit(unit, target) and not target.is_debuffed:
+                score += self.STATUS_VALUE
+        return score - ability.mana_cost / 10  # Keep mana when the gain is the same
+
+
+
+
+    def ranked(self, engine, unit):
+        """Candidate plans, best first."""
+        goal = objective(engine, unit)
+        plans = candidate_plans(engine, unit)
+        scores = [self.score(engine, unit, plan, goal) for plan in plans]
+        return [plan for _, plan in sorted(zip(scores, plans), key=lambda item: -item[0])]
+
+
+
+
+    def choose(self, engine, unit):
+        goal = objective(engine, unit)
+        best, best_score = [], None
+        for plan in candidate_plans(engine, unit):
+            score = self.score(engine, unit, plan, goal)
+            if best_score is None or score > best_score:
+                best, best_score = [plan], score
+            elif score == best_score:
+                best.append(plan)
+        return self.rng.choice(best)
+
+
+
+
+class SearchNode:
+    """A position in the MCTS tree, reached by `plan` played by a unit of `team`."""
+    __slots__ = ("state", "parent", "plan", "team", "children", "untried", "visits", "wins", "terminal")
+
+    def __init__(self, state, parent=None, plan=None, team=None, terminal=False):
+        self.state = state  # MatchState at the start of the next unit's turn
+        self.parent = parent
+        self.plan = plan
+        self.team = team
+        self.children = []
+        self.untried = None  # Plans not expanded yet, worst first (computed on the first visit)
+        self.visits = 0
+        self.wins = 0.0  # Sum of rewards for `team`
+        self.terminal = terminal
+
+
+
+
+    def select(self, exploration):
+        """Child with the best UCB1 score."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+
+
+class MCTSPolicy:
+    """
+    Monte Carlo Tree Search over whole turns: nodes are positions at the start of a unit's turn, moves are
+    the plans GreedyPolicy ranks highest, and leaves are scored by a short greedy rollout and evaluate().
+    Search runs on the engine it is given, through state capture/restore and with its own random streams,
+    so the match itself (including its random streams) is left exactly as it was.
+    Stops after `iterations` playouts or `think_time` seconds, whichever comes first.
+    """
+    name = "mcts"
+    EXPLORATION = 0.7  # UCB1 exploration constant (rewards are in [0, 1])
+    BRANCHING = 8  # Plans considered per position
+    ROLLOUT_TURNS = 4  # Greedy turns played past a new leaf before evaluating it
+
+    def __init__(self, rng, iterations=Gameplay.AI_ITERATIONS, think_time=None):
+        self.rng = rng
+        self.iterations = iterations
+        self.think_time = think_time
+        self.last_iterations = 0  # Playouts done by the last search
+
+
+
+
+    def choose(self, engine, unit):
+        root = SearchNode(capture(engine))
+        match_rng = engine.rng
+        search_rng = RandomService(self.rng.getrandbits(64))
+        engine.set_rng(search_rng)
+        rollout = GreedyPolicy(search_rng.stream("rollout"))
+        deadline = time.perf_counter() + self.think_time if self.think_time is not None else None
+        iterations = 0
+        try:
+            while self.iterations is None or iterations < self.iterations:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                self.playout(engine, root, rollout)
+                iterations += 1
+        finally:
+            restore(engine, root.state)
+            engine.set_rng(match_rng)
+        self.last_iterations = iterations
+        if not root.children:
+            return rollout.choose(engine, unit)
+        return max(root.children, key=lambda child: child.visits).plan
+
+
+
+
+    def playout(self, engine, root, rollout):
+        """One MCTS iteration: select, expand one plan, roll out, back the reward up."""
+        node = root
+        while not node.untried and node.children:
+            node = node.select(self.EXPLORATION)
+        restore(engine, node.state)
+        if node.untried is None:
+            node.untried = [] if node.terminal else rollout.ranked(engine, engine.current_unit())[:self.BRANCHING][::-1]
+        if node.untried:
+            plan = node.untried.pop()
+            team = engine.current_unit().color
+            _, stalled = execute(engine, engine.current_unit(), plan)
+            child = SearchNode(capture(engine), node, plan, team, stalled or engine.winner is not None)
+            node.children.append(child)
+            node = child
+            for _ in range(self.ROLLOUT_TURNS):
+                if engine.winner is not None or stalled:
+                    break
+                _, stalled = take_turn(engine, rollout)
+
+        reward = evaluate(engine, "blue")
+        while node is not None:
+            node.visits += 1
+            node.wins += reward if node.team == "blue" else 1 - reward
+            node = node.parent
+
+
+
+
+def plan_kills(engine, unit, plan):
+    """Units the plan should take down (ignoring critical hits)."""
+    _, ability_index, target_tile = plan
+    if ability_index is None:
+        target = engine.occupancy.first_at(target_tile[0], target_tile[1], exclude_color=unit.color)
+        if target is not None and can_hit(unit, target) and effective_damage(target, unit.damage) >= target.health:
+            return [target]
+        return []
+    ability = unit.abilities[ability_index]
+    if ability.ability_type != "damage":
+        return []
+    if ability.is_aoe:
+        targets = engine.occupancy.within(target_tile[0], target_tile[1], ability.is_aoe)
+    else:
+        targets = engine.occupancy.at(*target_tile)[:1]
+    return [target for target in targets if target is not unit and can_hit(unit, target)
+            and effective_damage(target, ability.attack + unit.damage, ability.damage_type) >= target.health]
+
+
+
+
+class SearchTimeout(Exception):
+    """Raised inside AlphaBetaPolicy when the time budget runs out mid-iteration."""
+
+
+
+
+class AlphaBetaPolicy:
+    """
+    Deterministic minimax over whole turns with alpha-beta pruning. Turns follow the engine's order (both
+    units of a team play in a row), so each position maximizes or minimizes evaluate() for the searching
+    team according to whose unit is up. Iterative deepening one unit-turn at a time, until `depth` or
+    `think_time` is reached; plans are tried best first (the table's best plan, then kills of key holders,
+    other kills, pickups, then GreedyPolicy's score) and only the BRANCHING first are searched.
+    Results are kept in a Zobrist-keyed TranspositionTable of `table_bytes`; combat rolls inside the search
+    come from streams seeded by the position's key, so a position and plan always lead to the same child.
+    """
+    name = "alphabeta"
+    BRANCHING = 6  # Plans searched per position
+
+    def __init__(self, rng, depth=Gameplay.AI_SEARCH_DEPTH, think_time=None,
+                 table_bytes=Gameplay.AI_TABLE_MB * 1024 * 1024):
+        self.rng = rng  # Only breaks ties in the move ordering (GreedyPolicy)
+        self.depth = depth
+        self.think_time = think_time
+        self.hasher = ZobristHasher()
+        self.table = TranspositionTable(table_bytes)
+        self.greedy = GreedyPolicy(rng)
+        self.stats = {"searches": 0, "nodes": 0, "seconds": 0.0, "depth": 0}
+        self.team = None
+        self.deadline = None
+
+
+
+
+    def choose(self, engine, unit):
+        root = capture(engine)
+        key = self.hasher.hash(root)
+        match_rng = engine.rng
+        self.team = unit.color
+        self.deadline = time.perf_counter() + self.think_time if self.think_time is not None else None
+        start = time.perf_counter()
+        nodes = self.stats["nodes"]
+        best = None
+        try:
+            for depth in range(1, self.depth + 1):
+                try:
+                    _, plan = self.search(engine, root, key, depth, -math.inf, math.inf)
+                except SearchTimeout:
+                    break
+                if plan is not None:
+                    best = plan
+                self.stats["depth"] += 1
+        finally:
+            restore(engine, root)
+            engine.set_rng(match_rng)
+        self.stats["searches"] += 1
+        self.stats["seconds"] += time.perf_counter() - start
+        if best is None:
+            return self.greedy.choose(engine, unit)
+        return best
+
+
+
+
+    def ordered_plans(self, engine, unit, first):
+        """The BRANCHING most promising plans, in the order they are searched."""
+        goal = objective(engine, unit)
+        pickups = engine.pickup.by_tile
+        ranked = []
+        for plan in candidate_plans(engine, unit):
+            kills = plan_kills(engine, unit, plan)
+            key_kills = sum(target.red_keys + target.blue_keys > 0 for target in kills)
+            ranked.append(((plan == first, key_kills, len(kills), plan[0] in pickups,
+                            self.greedy.score(engine, unit, plan, goal)), plan))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [plan for _, plan in ranked[:self.BRANCHING]]
+
+
+
+
+    def search(self, engine, state, key, depth, alpha, beta):
+        """Minimax value of `state` (keyed `key`) searched `depth` unit-turns deep, and its best plan."""
+        self.stats["nodes"] += 1
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+        first = None
+        entry = self.table.probe(key)
+        if entry is not None:
+            entry_depth, value, bound, first = entry
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return value, first
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                elif bound == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value, first
+
+        restore(engine, state)
+        if depth == 0 or engine.winner is not None:
+            return evaluate(engine, self.team), None
+
+        unit = engine.current_unit()
+        maximizing = unit.color == self.team
+        original_alpha, original_beta = alpha, beta
+        best_value = -math.inf if maximizing else math.inf
+        best_plan = None
+        for index, plan in enumerate(self.ordered_plans(engine, unit, first)):
+            if index:
+                restore(engine, state)
+            engine.set_rng(RandomService(key))
+            _, stalled = execute(engine, unit, plan)
+            if stalled:
+                value = evaluate(engine, self.team)
+            else:
+                child = capture(engine)
+                value, _ = self.search(engine, child, self.hasher.update(key, state, child), depth - 1, alpha, beta)
+            if maximizing and value > best_value or not maximizing and value < best_value:
+                best_value, best_plan = value, plan
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if best_plan is None:  # No plan at all (cannot happen while the unit can stay put)
+            return evaluate(engine, self.team), None
+        if best_value <= original_alpha:
+            bound = UPPER
+        elif best_value >= original_beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, depth, best_value, bound, best_plan)
+        return best_value, best_plan
+
+
+
+
+    def search_stats(self):
+        """Counters of every search so far (nodes, seconds, table probes and hits...), to add up across matches."""
+        return dict(self.stats, probes=self.table.probes, hits=self.table.hits)
+
+
+
+
+    def report(self):
+        """Search speed and table use so far, on one line."""
+        stats = self.stats
+        rate = stats["nodes"] / stats["seconds"] if stats["seconds"] else 0.0
+        depth = stats["depth"] / stats["searches"] if stats["searches"] else 0.0
+        return (f"{stats['nodes']} nodes in {stats['seconds']:.1f}s ({rate:.0f} nodes/s), "
+                f"average depth {depth:.1f}, table hit rate {self.table.hit_rate():.1%} "
+                f"({len(self.table)}/{self.table.capacity} entries, {self.table.evictions} evicted)")
+
+
+
+
+SEARCH_ENGINES = {}  # In a search worker: (blue names, red names) -> engine the searches run on
+SEARCHERS = {}  # In a search worker: (policy name, team) -> policy, kept across turns (alpha-beta reuses its table)
+
+
+
+
+def init_search_worker():
+    """Ctrl+C is the game's business, not the search process's."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+
+
+def search_turn(teams, encoded_state, seed, policy, options):
+    """Search-process side of BackgroundSearch: rebuild the position and return the plan for its current unit."""
+    engine = SEARCH_ENGINES.get(teams)
+    if engine is None:
+        engine = Engine(create_roster(*teams))
+        SEARCH_ENGINES[teams] = engine
+    restore(engine, MatchState.decode(encoded_state))
+    unit = engine.current_unit()
+    searcher = SEARCHERS.get((policy, unit.color))
+    if searcher is None:
+        searcher = POLICIES[policy](random.Random(seed), **options)
+        SEARCHERS[(policy, unit.color)] = searcher
+    return searcher.choose(engine, unit)
+
+
+
+
+class BackgroundSearch:
+    """
+    Runs a search policy (MCTSPolicy or AlphaBetaPolicy) for the game in a separate process, so the render
+    loop keeps its frame rate while the AI thinks. The position is sent over as an encoded MatchState and
+    replayed on an engine of the process' own. `options` are the policy's keyword arguments (budgets).
+    """
+    def __init__(self, policy="mcts", options=None):
+        self.policy = policy
+        self.options = options or {}
+        # "spawn": the search process must not inherit the game's display and audio state
+        self.pool = multiprocessing.get_context("spawn").Pool(1, initializer=init_search_worker)
+
+
+
+
+    def start(self, engine, seed):
+        """Start searching the turn of the engine's current unit. Returns an AsyncResult of the plan."""
+        teams = (tuple(unit.name for unit in engine.units[0:2]), tuple(unit.name for unit in engine.units[2:4]))
+        return self.pool.apply_async(search_turn, (teams, capture(engine).encode(), seed, self.policy, self.options))
+
+
+
+
+    def close(self):
+        """Stop the search process at once, dropping any search in progress (so quitting never waits for it)."""
+        self.pool.terminate()
+
+
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+    "mcts": MCTSPolicy,
+    "alphabeta": AlphaBetaPolicy,
+}
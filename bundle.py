@@ -0,0 +1,220 @@
+"""
+Asset bundle - Every referenced image, font and sound packed into one memory-mapped file
+
+Build it with `python bundle.py` after changing assets. Images are stored as raw pixels (pre-scaled when
+they are only ever drawn at one size), short sounds as PCM in the mixer's format, fonts and long music as
+their original bytes. At runtime surfaces come from pygame.image.frombuffer instead of being decoded.
+Entries whose source file changed since the build are ignored, and the loose files are used instead.
+"""
+import io
+import os
+import json
+import mmap
+import struct
+import threading
+import pygame
+from constants import *
+
+MAGIC = b"LOBBNDL1"
+PCM_MAX_SECONDS = 10  # Longer sounds (the music) keep their compressed bytes instead of PCM
+
+# Images always drawn at a single size are stored already scaled to it
+PRESCALED = {
+    Assets.GRASS: (CELL_SIZE, CELL_SIZE),
+    Assets.WATER: (CELL_SIZE, CELL_SIZE),
+    Assets.ROCK: (CELL_SIZE, CELL_SIZE),
+    Assets.BUSH: (CELL_SIZE, CELL_SIZE),
+    Assets.BARRIER: (CELL_SIZE, CELL_SIZE),
+    Assets.INDICATOR: (UI.TARGET_INDICATOR_SIZE, UI.TARGET_INDICATOR_SIZE),
+    Assets.INDICATOR1: (UI.TARGET_INDICATOR_SIZE, UI.TARGET_INDICATOR_SIZE),
+    Assets.RED_SQUARE: (UI.TARGET_INDICATOR_SIZE, UI.TARGET_INDICATOR_SIZE),
+    Assets.RED_POTION: (CELL_SIZE // 2, CELL_SIZE // 2),
+    Assets.BLUE_POTION: (CELL_SIZE // 2, CELL_SIZE // 2),
+    Assets.GREEN_POTION: (CELL_SIZE // 2, CELL_SIZE // 2),
+    Assets.GOLDEN_POTION: (CELL_SIZE // 2, CELL_SIZE // 2),
+    Assets.BLACK_POTION: (CELL_SIZE // 2, CELL_SIZE // 2),
+    Assets.RED_KEY: (UI.KEY_ICON_SIZE, UI.KEY_ICON_SIZE),
+    Assets.BLUE_KEY: (UI.KEY_ICON_SIZE, UI.KEY_ICON_SIZE),
+    Assets.MAIN_SCREEN: (SCREEN_WIDTH, SCREEN_HEIGHT),
+    Assets.LOL_BACKGROUND: (SCREEN_WIDTH, SCREEN_HEIGHT),
+    Assets.CHAMP_SELECT: (SCREEN_WIDTH, SCREEN_HEIGHT),
+    Assets.GAME_OVER: (SCREEN_WIDTH, SCREEN_HEIGHT),
+}
+
+
+
+
+def source_stamp(path):
+    """Size and modification time of a loose file, used to spot stale bundle entries."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+
+
+class AssetBundle:
+    """Read side of the bundle: maps the file once and serves surfaces, sounds and raw bytes from it."""
+    def __init__(self, path=Assets.BUNDLE):
+        self.path = path
+        self.entries = None  # path -> index entry, read on first lookup
+        self.mixer_format = None  # (frequency, size, channels) the PCM was recorded in
+        self.data = None  # memoryview over the mapped file
+        self.lock = threading.Lock()  # The sound loader thread may open the bundle too
+
+
+
+
+    def open(self):
+        """Map the bundle and read its index (an absent or foreign file just means an empty bundle)."""
+        if not os.path.exists(self.path):
+            self.entries = {}
+            return
+        with open(self.path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_WILLNEED"):
+            mapped.madvise(mmap.MADV_WILLNEED)  # Read the whole file ahead in one sequential pass
+        if mapped[:len(MAGIC)] != MAGIC:
+            print(f"Ignoring {self.path}: not an asset bundle")
+            self.entries = {}
+            return
+
+        (index_length,) = struct.unpack_from("<I", mapped, len(MAGIC))
+        index_start = len(MAGIC) + 4
+        index = json.loads(bytes(mapped[index_start:index_start + index_length]))
+        self.data = memoryview(mapped)[index_start + index_length:]
+        self.mixer_format = tuple(index["mixer"]) if index["mixer"] else None
+        self.entries = index["entries"]  # Set last: other threads treat it as "opened"
+
+
+
+
+    def lookup(self, path):
+        """Index entry for `path`, or None if it isn't bundled or its source changed since the build."""
+        if self.entries is None:
+            with self.lock:
+                if self.entries is None:
+                    self.open()
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        if os.path.exists(path) and source_stamp(path) != entry["source"]:
+            return None
+        return entry
+
+
+
+
+    def blob(self, entry):
+        """The bytes of an entry, without copying them out of the mapping."""
+        return self.data[entry["offset"]:entry["offset"] + entry["length"]]
+
+
+
+
+    def image(self, path):
+        """Surface for a bundled image, or None."""
+        entry = self.lookup(path)
+        if entry is None or entry["kind"] != "pixels":
+            return None
+        return pygame.image.frombuffer(self.blob(entry), entry["size"], entry["format"])
+
+
+
+
+    def sound(self, path):
+        """pygame.mixer.Sound for a bundled sound, or None (also when the mixer format differs from the build)."""
+        entry = self.lookup(path)
+        if entry is None:
+            return None
+        if entry["kind"] == "pcm":
+            if pygame.mixer.get_init() != self.mixer_format:
+                return None
+            return pygame.mixer.Sound(buffer=self.blob(entry))
+        if entry["kind"] == "file":
+            return pygame.mixer.Sound(file=io.BytesIO(self.blob(entry)))
+        return None
+
+
+
+
+    def file(self, path):
+        """File-like object over a bundled file's original bytes (fonts), or None."""
+        entry = self.lookup(path)
+        if entry is None or entry["kind"] != "file":
+            return None
+        return io.BytesIO(self.blob(entry))
+
+
+
+
+def referenced_assets():
+    """Every file named in constants.Assets and sounds.SOUND_FILES, in a stable order."""
+    from sounds import SOUND_FILES
+    paths = [value for name, value in vars(Assets).items() if not name.startswith("_") and isinstance(value, str)]
+    paths += list(SOUND_FILES.values())
+    return [path for path in dict.fromkeys(paths) if path != Assets.BUNDLE]
+
+
+
+
+def pack(path):
+    """Encode one asset: (index entry without offset, payload bytes), or None for unsupported files."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".png", ".jpg", ".jpeg"):
+        image = pygame.image.load(path)
+        if path in PRESCALED:
+            image = pygame.transform.scale(image, PRESCALED[path])
+        has_alpha = image.get_flags() & pygame.SRCALPHA or image.get_colorkey() is not None
+        pixel_format = "RGBA" if has_alpha else "RGB"
+        return {"kind": "pixels", "size": list(image.get_size()), "format": pixel_format}, pygame.image.tobytes(image, pixel_format)
+    if extension in (".mp3", ".ogg", ".wav"):
+        sound = pygame.mixer.Sound(path)
+        if sound.get_length() <= PCM_MAX_SECONDS:
+            return {"kind": "pcm"}, sound.get_raw()
+    if extension in (".mp3", ".ogg", ".wav", ".ttf", ".otf"):
+        with open(path, "rb") as file:
+            return {"kind": "file"}, file.read()
+    return None
+
+
+
+
+def build(output=Assets.BUNDLE):
+    """Pack every referenced asset into `output`. Missing files are reported and left out."""
+    pygame.mixer.init()
+    entries = {}
+    payloads = []
+    offset = 0
+    for path in referenced_assets():
+        if not os.path.exists(path):
+            print(f"Skipping {path}: file not found")
+            continue
+        packed = pack(path)
+        if packed is None:
+            continue
+        entry, payload = packed
+        entry.update(offset=offset, length=len(payload), source=source_stamp(path))
+        entries[path] = entry
+        payloads.append(payload)
+        offset += len(payload)
+
+    index = json.dumps({"mixer": pygame.mixer.get_init(), "entries": entries}).encode()
+    with open(output, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<I", len(index)))
+        file.write(index)
+        for payload in payloads:
+            file.write(payload)
+    print(f"Packed {len(entries)} assets into {output} ({os.path.getsize(output) / 1e6:.1f} MB)")
+
+
+
+
+# Opened lazily by the image, font and sound loaders
+bundle = AssetBundle()
+
+
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,108 @@
+"""
+Combat resolver - Many hits resolved in one pass, with the same results as Unit.attack hit after hit
+
+resolve() works on plain arrays (raw damage, crit chances, defenses, health, barrier shields, crit rolls)
+and is what balance sweeps call directly. It uses NumPy when it is installed and the batch has at least
+NUMPY_MIN_HITS hits, and the pure Python loop otherwise; both give identical integers.
+strike() applies a batch of hits to units, drawing the crit rolls from the gameplay stream in the same
+order as calling Unit.attack for each hit would.
+"""
+try:
+    import numpy
+except ImportError:  # Optional: the pure Python path gives the same results
+    numpy = None
+
+# Smallest batch resolved with NumPy: any AoE cast that catches more than one unit, so the array path runs
+# in real matches. It costs some 30 microseconds more per cast than the loop, which no frame notices.
+NUMPY_MIN_HITS = 2
+
+
+
+
+def roll_crits(rng, count):
+    """`count` crit rolls (1-100) from `rng`, one per hit, as Unit.attack draws them."""
+    return [rng.randint(1, 100) for _ in range(count)]
+
+
+
+
+def resolve(raw_damage, crit_chance, defense, health, shielded, rolls):
+    """
+    Resolve hits given as parallel sequences, one entry per hit:
+        raw_damage   damage before defense (negative for heals, which are never crits nor mitigated)
+        crit_chance  attacker's crit chance; a roll <= crit_chance doubles positive damage
+        defense      target's defense against the hit's damage type
+        health       target's health before the hit (each target is expected once per batch)
+        shielded     True when the target is a Nexus behind its barrier (takes nothing)
+        rolls        crit rolls, see roll_crits
+    :return: (dealt, health_after, dead); arrays when NumPy is used, lists otherwise.
+    """
+    if numpy is not None and len(raw_damage) >= NUMPY_MIN_HITS:
+        raw = numpy.asarray(raw_damage, dtype=numpy.int64)
+        defense = numpy.asarray(defense, dtype=numpy.int64)
+        multiplier = numpy.where((numpy.asarray(rolls) <= numpy.asarray(crit_chance)) & (raw > 0), 2, 1)
+        mitigated = numpy.trunc(raw * multiplier * (1 - defense / (defense + 100))).astype(numpy.int64)
+        dealt = numpy.where(numpy.asarray(shielded, dtype=bool), 0, numpy.where(raw > 0, mitigated, raw))
+        after = numpy.asarray(health, dtype=numpy.int64) - dealt
+        dead = after <= 0
+        return dealt, numpy.where(dead, 0, after), dead
+
+    dealt, after, dead = [], [], []
+    for raw, chance, armor, hp, shield, roll in zip(raw_damage, crit_chance, defense, health, shielded, rolls):
+        if raw > 0:
+            multiplier = 2 if roll <= chance else 1
+            damage = int(raw * multiplier * (1 - armor / (armor + 100)))
+        else:
+            damage = raw
+        if shield:
+            damage = 0
+        hp -= damage
+        dealt.append(damage)
+        after.append(max(hp, 0))
+        dead.append(hp <= 0)
+    return dealt, after, dead
+
+
+
+
+def can_retaliate(attacker, target):
+    """Whether a hit on `target` may make it strike back (monsters with the attacker in range)."""
+    return target.unit_type == "monster" and target.in_range(attacker)
+
+
+
+
+def strike(hits):
+    """
+    Apply hits given as (attacker, target, raw damage, damage type) to the units, like Unit.attack would.
+    Hits are resolved in runs that stop after each hit a monster may retaliate against, so its
+    counter-attack draws its crit roll at the same point of the stream as with Unit.attack.
+    :return: Damage dealt by each hit.
+    """
+    results = []
+    start = 0
+    while start < len(hits):
+        end = start
+        while end < len(hits) - 1 and not can_retaliate(hits[end][0], hits[end][1]):
+            end += 1
+        run = hits[start:end + 1]
+        rolls = roll_crits(run[0][0].rng.gameplay, len(run))
+        dealt, after, dead = resolve(
+            [raw for _, _, raw, _ in run],
+            [attacker.crit_chance for attacker, _, _, _ in run],
+            [target.physical_defense if damage_type == "physical" else target.magical_defense
+             for _, target, _, damage_type in run],
+            [target.health for _, target, _, _ in run],
+            [target.unit_type == "base" and target.barrier_status == "Up" for _, target, _, _ in run],
+            rolls,
+        )
+        for (attacker, target, _, damage_type), damage, health, killed in zip(run, dealt, after, dead):
+            damage = int(damage)
+            target.health = int(health)
+            target.view.show_damage(damage, damage_type)
+            if killed:
+                target.alive = False
+            target.react_to_attack(attacker)
+            results.append(damage)
+        start = end + 1
+    return results
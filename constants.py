@@ -8,6 +8,7 @@ CELL_SIZE = 43
 SCREEN_WIDTH = CELL_SIZE * GRID_SIZE + 300
 SCREEN_HEIGHT = CELL_SIZE * GRID_SIZE + 100
 FPS = 60
+RENDER_MODE = "full"  # "full" redraws every frame, "dirty" repaints only what changed
 
 # Colors (RGB)
 class Colors:
@@ -86,13 +87,27 @@ class Gameplay:
     SCREEN_SHAKE_INTENSITY = 8  # Maximum shake offset in pixels
     FLASH_DURATION_MS = 150  # How long screen flash lasts
 
+    # Particles
+    PARTICLE_CAPACITY = 4096  # Pool size; bursts beyond it are dropped
+    PARTICLE_MAX_LIFE = 40  # Frames; particles fade out over their life
+    PARTICLE_GRAVITY = 0.2  # Added to vertical speed every frame
+
+    # AI players
+    AI_ITERATIONS = 200  # MCTS playouts per turn when no time budget is given
+    AI_THINK_TIME_S = 1.0  # Default MCTS time budget per turn in game
+    AI_SEARCH_DEPTH = 4  # Unit-turns searched ahead by the alpha-beta AI
+    AI_TABLE_MB = 64  # Memory budget of the alpha-beta transposition table
+    AI_ACTION_DELAY_MS = 150  # Pause between the actions of an AI turn, so it can be followed on screen
+
 # UI Layout
 class UI:
     # Info Panel
     INFO_PANEL_WIDTH = 300
     INFO_PANEL_PADDING = 10
     INFO_PANEL_LINE_SPACING = 5
-    EVENT_LOG_MAX_EVENTS = 10
+    EVENT_LOG_MAX_EVENTS = 10  # Events shown at once
+    EVENT_LOG_HISTORY = 5000  # Events kept for scrolling back
+    EVENT_LOG_FONT_SIZE = 22
 
     # Abilities Bar
     ABILITIES_BAR_HEIGHT = 100
@@ -107,10 +122,16 @@ class UI:
     HEALTH_BAR_ANIMATION_SPEED = 0.15  # How fast bars animate (0-1, higher = faster)
     HEALTH_SEGMENT_SIZE = 100  # HP per segment marker
 
+    # Target Cursor
+    TARGET_INDICATOR_SIZE = int(CELL_SIZE * 1.2)
+
     # Key Display
     KEY_ICON_SIZE = 30
     UNIT_ICON_SIZE_RATIO = 3/4  # Ratio to CELL_SIZE
 
+    # Rendered text cache (LRU entries)
+    TEXT_CACHE_SIZE = 512
+
     # Damage Text
     DAMAGE_TEXT_SIZE = 18
     DAMAGE_TEXT_FADE_RATE = 4
@@ -172,6 +193,9 @@ class Assets:
     MOVING = "sounds/moving.mp3"
     WATER_SOUND = "sounds/water.mp3"
 
+    # Packed, pre-decoded copy of the files above (built by bundle.py, optional)
+    BUNDLE = "assets.bundle"
+
 # Audio Volume Settings
 class Volume:
     MUSIC_DEFAULT = 0.03
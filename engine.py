@@ -0,0 +1,541 @@
+"""
+Game engine - Rules and turn flow with no display, audio or keyboard code, so matches can run headless
+"""
+from interface import Grid, Pickup
+from spatial import OccupancyIndex
+from rng import random_service
+from constants import *
+from config import RESPAWN_LOCATIONS, MONSTER_BUFF_BONUSES, TERRAIN_OVERLAYS, TEAM_POSITIONS
+
+
+
+
+def create_roster(blue_names, red_names):
+    """
+    Headless team selection: the match roster (blue team, red team, monsters, then bases) for the
+    champions named in blue_names and red_names, placed like the champion select screen places them.
+    """
+    from unit import Unit  # Only roster building needs the unit classes
+    units = Unit.create_units(None)
+    champions = {unit.name: unit for unit in units if unit.unit_type == "player"}
+    teams = []
+    for color, names in (("blue", blue_names), ("red", red_names)):
+        for position, name in zip(TEAM_POSITIONS[color], names):
+            unit = champions.pop(name)  # KeyError for unknown or twice-picked champions
+            unit.color = color
+            unit.x, unit.y = position
+            unit.initial_x, unit.initial_y = position
+            unit.target_x, unit.target_y = position
+            teams.append(unit)
+    return (teams + [unit for unit in units if unit.unit_type == "monster"]
+            + [unit for unit in units if unit.unit_type == "base"])
+
+
+
+
+class Engine:
+    """
+    State of one match (units, grid, pickups, keys, barriers, turn counter) and the rules that change it.
+
+    Everything happens through apply_action(action), where action is one of:
+        ("move", dx, dy)          Step the current unit during its move phase
+        ("confirm_move",)         Finish moving on the current tile
+        ("move_target", dx, dy)   Move the attack cursor
+        ("select_ability", i)     Select ability i of the current unit (None cancels)
+        ("attack",)               Use the selected ability, or a basic attack
+        ("end_turn",)             Pass to the next unit once the current one is done (or stuck, see stuck())
+
+    What a front end may want to show is returned as event tuples:
+        ("log", message), ("sound", name), ("moved", unit, terrain), ("shake",), ("flash", color),
+        ("particles", x, y, color, count), ("monster_defeated", monster, message),
+        ("vision", team_color), ("game_over", winner_team)
+    """
+    def __init__(self, units, grid=None, pickup=None, rng=None):
+        self.units = units  # Blue team, red team, monsters, then bases
+        rng = rng if rng is not None else random_service  # Seeded RandomService for reproducible matches
+        self.occupancy = OccupancyIndex()  # Living units by tile, updated by the units themselves
+        self.occupancy.track(units)
+        for unit in units:
+            unit.console = self.console
+        self.grid = grid if grid is not None else Grid(GRID_SIZE, {})
+        if pickup is None:
+            pickup = Pickup()
+            pickup.rng = rng
+            pickup.initialize({})  # No textures: pickups exist but are never drawn
+        self.pickup = pickup
+        self.set_rng(rng)
+
+        self.current_unit_index = 0
+        self.current_turn = 1
+        self.blue_barrier = "Up"
+        self.red_barrier = "Up"
+        self.keys_initialized = False
+        self.winner = None  # Winning team once a Nexus falls
+        self.events = []  # Events emitted since the last take_events()
+
+        self.manage_keys()  # Initializes keys
+        self.emit("vision", self.current_unit().color)
+
+
+
+
+    def set_rng(self, rng):
+        """Make every random draw of the match (combat rolls, pickups) come from the RandomService `rng`."""
+        self.rng = rng
+        for unit in self.units:
+            unit.rng = rng
+        self.pickup.rng = rng
+
+
+
+
+    def emit(self, *event):
+        """Record an event for the front end."""
+        self.events.append(event)
+
+
+
+
+    def take_events(self):
+        """Return the events emitted so far and start a new batch."""
+        events, self.events = self.events, []
+        return events
+
+
+
+
+    def log(self, message):
+        """Add a line to the battle log."""
+        self.emit("log", message)
+
+
+
+
+    def console(self, message):
+        """Report a gameplay message meant for the console, which the front end prints (the units' messages too)."""
+        self.emit("console", message)
+
+
+
+
+    def current_unit(self):
+        """The unit whose turn it is."""
+        return self.units[self.current_unit_index]
+
+
+
+
+    def apply_action(self, action):
+        """
+        Apply one action for the current unit.
+        :param action: Action tuple (see the class docstring); actions that don't fit the unit's state are ignored.
+        :return: List of events the action produced.
+        """
+        kind = action[0]
+        if self.winner is None:
+            if kind == "move":
+                self.move(action[1], action[2])
+            elif kind == "confirm_move":
+                self.confirm_move()
+            elif kind == "move_target":
+                self.move_target(action[1], action[2])
+            elif kind == "select_ability":
+                self.select_ability(action[1])
+            elif kind == "attack":
+                self.attack()
+            elif kind == "end_turn":
+                self.end_turn()
+            else:
+                raise ValueError(f"Unknown action: {kind}")
+            self.check_game_over()
+        return self.take_events()
+
+
+
+
+    def move(self, dx, dy):
+        """Step the current unit one tile, within the range it had at the start of its turn."""
+        unit = self.current_unit()
+        if unit.state == "move" and unit.move(dx, dy, self.grid):
+            self.emit("moved", unit, self.grid.tiles[unit.x][unit.y].terrain)
+
+
+
+
+    def confirm_move(self):
+        """Finish the move phase, unless another unit is standing on the tile."""
+        current_unit = self.current_unit()
+        if current_unit.state != "move":
+            return
+
+        if self.occupancy.first_at(current_unit.x, current_unit.y, exclude=current_unit) is None:
+            self.log(f"{current_unit.name} finalized move at ({current_unit.x}, {current_unit.y}).")
+
+            for p in self.pickup.pickups_at(current_unit.x, current_unit.y):
+                self.pickup.picked_used(current_unit, p)
+                self.emit("sound", "potion")
+
+            current_unit.state = "attack"
+            current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y  # Initialize cursor
+            self.emit("vision", current_unit.color)
+
+        #check if there is enemy in bush
+        elif self.grid.tiles[current_unit.x][current_unit.y].overlay == "bush" and self.occupancy.first_at(
+                current_unit.x, current_unit.y, exclude_color=current_unit.color
+            ):   #in the presence of an enemy on this position but it's a bush u just get assassinated
+            enemy_unit = self.occupancy.first_at(current_unit.x, current_unit.y, exclude_color=current_unit.color)
+            if enemy_unit:
+                self.log(f"{current_unit.name} got assassinated")
+                enemy_unit.attack(current_unit, 9999)
+                current_unit.state = "done"
+                self.manage_keys(dead_player=current_unit, killer=enemy_unit)
+
+        else:      #if it's another unit u just can't finalise movement
+            self.log("can't finalise movement , another unit is filling this position")
+
+
+
+
+    def move_target(self, dx, dy):
+        """Move the attack cursor, staying on the grid and within the current attack range."""
+        unit = self.current_unit()
+        if unit.state != "attack":
+            return
+
+        # Determine current range restriction
+        if unit.selected_ability is not None:
+            current_range = unit.selected_ability.attack_radius
+        else:
+            current_range = unit.attack_range
+
+        new_target_x = min(max(unit.target_x + dx, 0), GRID_SIZE - 1)
+        new_target_y = min(max(unit.target_y + dy, 0), GRID_SIZE - 1)
+
+        # Enforce range restriction
+        if abs(unit.x - new_target_x) + abs(unit.y - new_target_y) <= current_range:
+            unit.target_x, unit.target_y = new_target_x, new_target_y
+
+
+
+
+    def select_ability(self, index):
+        """Select one of the current unit's abilities (None goes back to basic attacks) and re-center the cursor."""
+        unit = self.current_unit()
+        if unit.state != "attack":
+            return
+        if index is None:
+            unit.selected_ability = None
+        elif 0 <= index < len(unit.abilities):
+            unit.selected_ability = unit.abilities[index]
+        else:
+            return
+        unit.target_x, unit.target_y = unit.x, unit.y
+
+
+
+
+    def attack(self):
+        """Use the selected ability on the cursor, or a basic attack when none is selected."""
+        current_unit = self.current_unit()
+        if current_unit.state != "attack":
+            return
+
+        target = self.occupancy.first_at(current_unit.target_x, current_unit.target_y)
+        ability = current_unit.selected_ability
+
+        if ability is not None:
+            if ability.is_aoe > 0:   #logic when using aoe abilities
+                aoe_targets = ability.get_targets_in_aoe(current_unit, self.units, self.occupancy)
+                if ability.use(current_unit, aoe_targets):
+                    self.emit("sound", ability.name)
+                    current_unit.state = "done"
+                    current_unit.selected_ability = None  # Reset ability selection
+
+                # Handle monster defeats for AoE abilities
+                for targets in aoe_targets:
+                    self.handle_monster_defeat(targets, current_unit)
+                    if not targets.alive:
+                        self.manage_keys(dead_player=targets, killer=current_unit)
+
+            else:  #logic when using none aoe abilities
+                if target is not None:  # Ensure targets exist
+                    if ability.use(current_unit, target):
+                        self.emit("sound", ability.name)
+                        current_unit.state = "done"
+                        current_unit.selected_ability = None  # Reset ability selection
+                else:
+                    self.console("No valid target selected.")
+
+                # Handle monster defeat for non-AoE abilities
+                self.handle_monster_defeat(target, current_unit)
+                if target is not None and not target.alive:
+                    self.manage_keys(dead_player=target, killer=current_unit)
+
+        else:
+            self.basic_attack(current_unit)
+
+            # Basic attack sound if there is a target
+            if target is not None and target != current_unit:
+                self.emit("sound", f"{current_unit.name} Basic Attack")
+
+            # Handle monster defeat for basic attack
+            self.handle_monster_defeat(target, current_unit)
+            if target is not None and not target.alive:
+                self.manage_keys(dead_player=target, killer=current_unit)
+
+
+
+
+    def basic_attack(self, unit):
+        """Resolve the attack at the current target location."""
+        # Find a valid target at the attack cursor location
+        other_unit = self.occupancy.first_at(unit.target_x, unit.target_y, exclude_color=unit.color)
+        if other_unit is not None:
+            damage = unit.attack(other_unit, unit.damage)  # Use the Unit's attack method
+            if damage > 0:
+                self.log(f"{unit.name} attacked {other_unit.name} for {damage} damage!")
+                # Screen shake, flash, and particles on damage
+                self.emit("shake")
+                self.emit("flash", Colors.RED)
+                self.emit("particles", other_unit.x, other_unit.y, Colors.RED, 15)
+                if not other_unit.alive:
+                    self.log(f"{other_unit.name} has been defeated!")
+            else:
+                self.log(f"{unit.name} attacked {other_unit.name} but missed!")
+        else:
+            self.log(f"{unit.name} attacked but missed!")
+
+        unit.state = "done"  # Mark the unit as done after the attack
+
+
+
+
+    def handle_monster_defeat(self, target, killer):
+        """Handle buff acquisition and key transfer when a monster is defeated."""
+        if target is None or target.alive or target.unit_type != "monster":
+            return
+
+        # Apply team buff
+        for unit in self.units:
+            if unit.color == killer.color:
+                if target.name == "BigBuff":
+                    unit.max_health = int(unit.max_health * MONSTER_BUFF_BONUSES["BigBuff"]["max_health_multiplier"])
+                    unit.damage = int(unit.damage * MONSTER_BUFF_BONUSES["BigBuff"]["damage_multiplier"])
+                else:
+                    unit.max_health = int(unit.max_health * MONSTER_BUFF_BONUSES["other"]["max_health_multiplier"])
+                    unit.damage = int(unit.damage * MONSTER_BUFF_BONUSES["other"]["damage_multiplier"])
+
+        if target.red_keys == 1:
+            self.emit("monster_defeated", target, "You won a red key + buff")
+        elif target.blue_keys == 1:
+            self.emit("monster_defeated", target, "You won a blue key + buff")
+        else:
+            self.emit("monster_defeated", target, "You got the Buff")
+
+        # Transfer keys
+        self.manage_keys(dead_player=target, killer=killer)
+
+
+
+
+    def stuck(self, unit):
+        """True when every tile the unit can reach this turn is held by another unit, so it can only pass."""
+        occupancy = self.occupancy
+        return all(occupancy.first_at(x, y, exclude=unit) is not None
+                   for x, y in self.grid.reachable_tiles(unit.initial_x, unit.initial_y, unit.move_range))
+
+
+
+
+    def end_turn(self):
+        """Tick cooldowns, buffs, pickups, regeneration and respawns, then pass to the next unit."""
+        current_unit = self.current_unit()
+        if current_unit.state != "done" and not (current_unit.state == "move" and self.stuck(current_unit)):
+            return
+        self.current_turn += 1
+
+        #each turn we reduce the cooldowns and reduce the duration remaaning on the buffs
+        for unit in self.units:
+            for ability in unit.abilities:
+                ability.reduce_cooldown()
+        for unit in self.units:
+            unit.update_buffs_and_debuffs()
+
+        current_unit.state = "move"  # Reset state for the next turn
+        current_unit.initial_x, current_unit.initial_y = current_unit.x, current_unit.y  # Reset initial position
+        self.advance_to_next_unit()
+
+        self.emit("vision", self.current_unit().color)
+        self.pickup.update(self.current_turn, self.grid)
+        self.manage_keys(current_turn=self.current_turn)
+
+        # Health and mana regeneration each turn
+        for unit in self.units:
+            if unit.unit_type == "player":
+                unit.health += min(unit.max_health - unit.health, int(Gameplay.HEALTH_REGEN_PERCENT * unit.max_health))
+                unit.mana += min(unit.max_mana - unit.mana, int(Gameplay.MANA_REGEN_PERCENT * unit.max_mana))
+
+        # Respawn logic
+        respawn = min(self.current_turn // Gameplay.RESPAWN_BASE_TURNS, Gameplay.RESPAWN_MAX_CAP)
+
+        # Update death timers and respawn dead units
+        for unit in self.units:
+            if not unit.alive and unit.unit_type == "player":
+                unit.death_timer += 1  # Increment death timer for dead units
+                self.console(f"{unit.death_timer}seconds of death for {unit.name}")
+                if unit.death_timer >= respawn:
+                    self.log(f"{unit.name} has respawned at base!")
+                    unit.alive = True
+                    unit.health = unit.max_health  # Restore health
+                    unit.state = "move"
+                    unit.initial_x, unit.initial_y = self.get_respawn_location(unit)
+                    unit.x, unit.y = unit.initial_x, unit.initial_y
+                    unit.death_timer = 0  # Reset death timer
+
+
+
+
+    def advance_to_next_unit(self):
+        """Advance to the next unit, skipping dead ones."""
+        start_index = self.current_unit_index
+
+        #we keep incrementing the index untill we fullfil the conditions
+        while True:
+            self.current_unit_index = (self.current_unit_index + 1) % len(self.units)
+
+            # Check if the unit is alive and that is part of either team red or team blue
+            if (self.units[self.current_unit_index].alive
+                and self.units[self.current_unit_index].unit_type == "player"):
+                break
+
+            # If we've cycled through all units and come back to the start, stop (prevents infinite loops)
+            if self.current_unit_index == start_index:
+                self.log("No alive units remaining!")
+                return
+
+
+
+
+    def get_respawn_location(self, unit):
+        """Get respawn location for a unit based on their index."""
+        unit_index = self.units.index(unit)
+        return RESPAWN_LOCATIONS.get(unit_index, (0, 0))
+
+
+
+
+    def remove_barrier_from_grid(self, team):
+        """Remove barrier overlay from grid tiles when barrier falls."""
+        self.set_barrier_on_grid(team, up=False)
+
+
+
+
+    def set_barrier_on_grid(self, team, up):
+        """Show or clear a team's barrier overlay on the grid (restoring a saved state can raise it again)."""
+        barrier_positions = TERRAIN_OVERLAYS.get("barrier", [])
+        changed = []
+
+        for x, y in barrier_positions:
+            if 0 <= x < len(self.grid.tiles) and 0 <= y < len(self.grid.tiles[0]):
+                tile = self.grid.tiles[x][y]
+                # Red barriers are on the upper right (around x=17-20, y=0-3)
+                # Blue barriers are on the lower left (around x=0-3, y=17-20)
+                if (team == "red" and x >= 17) or (team == "blue" and y >= 17):
+                    overlay = "barrier" if up else None
+                    if tile.overlay != overlay:
+                        tile.overlay = overlay
+                        changed.append((x, y))
+
+        # Repaint only the changed cells of the terrain layer
+        if changed:
+            self.grid.invalidate(changed)
+
+
+
+
+    def manage_keys(self, dead_player=None, killer=None, current_turn=None):
+        """
+        Handles all key-related logic:
+        - Initializes keys at the start of the game.
+        - Transfers keys when a player dies.
+        - Spawns additional keys based on turn events.
+        - Tracks team progress on key collection.
+
+        :param dead_player: The unit that died (optional).
+        :param killer: The unit that killed the dead player (optional).
+        :param current_turn: The current turn number (optional).
+        """
+        # Initialize keys at the start of the game
+        if not self.keys_initialized:
+            self.units[0].blue_keys = 1  # Blue Player 1 starts with one Blue key
+            self.units[1].blue_keys = 1  # Blue Player 2 starts with one Blue key
+            self.units[2].red_keys = 1  # Red Player 1 starts with one Red key
+            self.units[3].red_keys = 1  # Red Player 2 starts with one Red key
+            self.keys_initialized = True
+            self.console(f"Initial keys have been assigned to players.")
+
+        # Handle key transfer on player death
+        if dead_player and killer:
+            if killer.unit_type == "player":
+                # Transfer keys to the killer
+                keys_collected = dead_player.red_keys + dead_player.blue_keys
+                killer.red_keys += dead_player.red_keys
+                killer.blue_keys += dead_player.blue_keys
+                self.console(f"{killer.name} collected {dead_player.red_keys} Red key(s) and {dead_player.blue_keys} Blue key(s) from {dead_player.name}.")
+                # Flash gold and spawn particles on key collection
+                if keys_collected > 0:
+                    self.emit("flash", Colors.GOLD)
+                    self.emit("particles", dead_player.x, dead_player.y, Colors.GOLD, 20)
+                dead_player.red_keys = 0
+                dead_player.blue_keys = 0
+            else:
+                # Keys are lost if the killer is not a player
+                self.console(f"{dead_player.name}'s {dead_player.red_keys} Red key(s) and {dead_player.blue_keys} Blue key(s) are not lost.")
+
+        # Check if the team got enough keys to break barrier
+        if self.units[0].red_keys + self.units[1].red_keys >= Gameplay.KEYS_REQUIRED_TO_BREAK_BARRIER:
+            if self.red_barrier != "Down":
+                self.console("blue team broke the red barrier")
+                self.units[-1].barrier_status = "Down"
+                self.red_barrier = "Down"
+                self.remove_barrier_from_grid("red")
+                self.emit("flash", (255, 100, 100))
+
+        if self.units[2].blue_keys + self.units[3].blue_keys >= Gameplay.KEYS_REQUIRED_TO_BREAK_BARRIER:
+            if self.blue_barrier != "Down":
+                self.console("red team broke the blue barrier")
+                self.units[-2].barrier_status = "Down"
+                self.blue_barrier = "Down"
+                self.remove_barrier_from_grid("blue")
+                self.emit("flash", (100, 100, 255))
+
+        # Spawn additional keys based on turn events
+        if current_turn:
+            if current_turn % Gameplay.MONSTER_RESPAWN_TURN_INTERVAL == 0:
+                # Assign keys to a monster
+                for unit in self.units:
+                    if unit.unit_type == "monster":
+                        if unit.alive == False:
+                            unit.health = unit.max_health
+                            unit.alive = True
+                            if unit.name == "BlueBuff":
+                                unit.blue_keys = 1
+                                self.console("BlueBuff now holds 1 Blue key")
+                            if unit.name == "RedBuff":
+                                unit.red_keys = 1
+                                self.console("RedBuff now holds 1 Red key.")
+
+
+
+
+    def check_game_over(self):
+        """Record the winner once either Nexus is destroyed."""
+        if self.winner is not None:
+            return
+        for unit in self.units:
+            if unit.unit_type == "base" and unit.health <= 0:
+                # The team whose Nexus is still standing wins
+                self.winner = "red" if unit.color == "blue" else "blue"
+                self.emit("game_over", self.winner)
+                return
@@ -0,0 +1,106 @@
+"""
+Fog of war - Incremental team visibility, recomputed only for units whose position or vision changed
+"""
+from collections import deque
+from constants import Gameplay
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Light propagation directions
+
+
+
+
+def unit_vision(grid, x, y, vision_range):
+    """
+    Tiles visible from (x, y): light spreads through traversable tiles and
+    lights up, but does not pass, the first non-traversable tile it hits.
+    """
+    size = len(grid.tiles)
+    visible = {(x, y)}
+    queue = deque([(x, y, 0)])  # BFS queue: (x, y, distance)
+
+    while queue:
+        cx, cy, distance = queue.popleft()
+        if distance >= vision_range:
+            continue
+        for dx, dy in DIRECTIONS:
+            nx, ny = cx + dx, cy + dy
+            if 0 <= nx < size and 0 <= ny < size and (nx, ny) not in visible:
+                visible.add((nx, ny))
+                if grid.tiles[nx][ny].traversable:
+                    queue.append((nx, ny, distance + 1))
+
+    return frozenset(visible)
+
+
+
+
+class FogOfWar:
+    """
+    Keeps each team's visible tiles up to date incrementally.
+    Every unit's visible set is cached by (position, vision range, terrain version) and a
+    per-tile reference count tracks how many allies see each tile, so moving one unit only
+    re-walks that unit's vision.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.unit_views = {}  # unit -> ((x, y, vision_range, terrain_version), tiles)
+        self.tile_counts = {}  # team -> {tile: number of allies seeing it}
+        self.visible = {}  # team -> set of visible tiles
+        self.versions = {}  # team -> bumped whenever the team's visible set changes
+
+
+
+
+    def reset(self):
+        """Forget all cached vision (new match). Versions keep counting so old states never look current."""
+        self.unit_views.clear()
+        self.tile_counts.clear()
+        self.visible.clear()
+        for team in self.versions:
+            self.versions[team] += 1
+
+
+
+
+    def update(self, units, team_color):
+        """
+        Refresh the visibility of one team.
+        :param units: All units; only living members of team_color give vision.
+        :return: The team's set of visible tiles (updated in place on later calls).
+        """
+        counts = self.tile_counts.setdefault(team_color, {})
+        visible = self.visible.setdefault(team_color, set())
+        version = self.versions.setdefault(team_color, 0)
+
+        for unit in units:
+            if unit.color != team_color:
+                continue
+            if unit.alive:
+                vision_range = unit.move_range + Gameplay.VISIBILITY_RANGE_BONUS
+                key = (unit.x, unit.y, vision_range, self.grid.version)
+            else:
+                key = None  # Dead units give no vision
+
+            cached = self.unit_views.get(unit)
+            if cached is not None and cached[0] == key:
+                continue  # Nothing this unit's vision depends on has changed
+
+            old_tiles = cached[1] if cached is not None else frozenset()
+            new_tiles = unit_vision(self.grid, *key[:3]) if key is not None else frozenset()
+            self.unit_views[unit] = (key, new_tiles)
+
+            for tile in old_tiles - new_tiles:
+                counts[tile] -= 1
+                if counts[tile] == 0:
+                    del counts[tile]
+                    visible.discard(tile)
+                    version += 1
+            for tile in new_tiles - old_tiles:
+                if tile not in counts:
+                    counts[tile] = 0
+                    visible.add(tile)
+                    version += 1
+                counts[tile] += 1
+
+        self.versions[team_color] = version
+        return visible
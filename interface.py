@@ -1,6 +1,10 @@
 import pygame
-import random
-from sounds import Sounds
+import heapq
+from collections import deque
+from itertools import islice
+from resources import atlas, fonts, text_cache, prepare_surface
+from spatial import disc_offsets
+from rng import random_service
 from constants import *
 from config import TERRAIN_LAKES, TERRAIN_HILLS, TERRAIN_OVERLAYS, PICKUP_TYPES 
 
@@ -15,7 +19,6 @@ class Tile:
         self.overlay = overlay  # Optional overlay: "bush", "barrier"
         self.textures_file = textures_file
         self.traversable = terrain in ["grass", "water"]  # Grass and water are traversable
-        self.highlighted = False  
                 
         # Assign move cost based on terrain type
         self.move_cost = {"grass": 1, "water": 2, "rock": float("inf")}[terrain]
@@ -24,16 +27,14 @@ class Tile:
 
 
     def draw_tile(self, screen):
-        """Draw the tile with its texture and overlay."""
+        """Draw the tile with its texture and overlay (textures are pre-scaled to a cell)."""
         rect = pygame.Rect(self.x * CELL_SIZE, self.y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
         # Draw the base terrain
-        self.texture = self.textures_file[self.terrain]
-        screen.blit(pygame.transform.scale(self.texture, (CELL_SIZE, CELL_SIZE)), rect)
+        screen.blit(atlas.get(self.terrain), rect)
 
         # Draw overlay on top, if present
         if self.overlay :
-            overlay_texture = self.textures_file[self.overlay]
-            screen.blit(pygame.transform.scale(overlay_texture, (CELL_SIZE, CELL_SIZE)), rect)
+            screen.blit(atlas.get(self.overlay), rect)
 
         # Optional: Draw tile border
         #pygame.draw.rect(screen, (0, 0, 0), rect, 1)  # Black border
@@ -47,12 +48,13 @@ class Pickup:
         if x is None and y is None and overlay is None and spawn_turn is None:
             # This is the manager instance
             self.all_pickups = []
+            self.by_tile = {}  # (x, y) -> pickups lying on that tile
             self.textures_file = None
             self.turn_count = 0
             self.allowed_tile_types = ["grass", "water"]
             self.pickup_types = PICKUP_TYPES
             self.next_spawn_turns = {}
-            self.sound = Sounds() 
+            self.rng = random_service  # Spawn timing and locations use its pickups stream
         else:
             # This is a pickup item instance
             self.x = x
@@ -68,7 +70,7 @@ class Pickup:
         """Initialize the pickup system and set initial next spawn attempts."""
         self.textures_file = textures_file
         for p_type in self.pickup_types:
-            self.next_spawn_turns[p_type] = random.randint(
+            self.next_spawn_turns[p_type] = self.rng.pickups.randint(
                 Gameplay.PICKUP_SPAWN_INITIAL_MIN,
                 Gameplay.PICKUP_SPAWN_INITIAL_MAX
             )
@@ -90,12 +92,12 @@ class Pickup:
             if self.turn_count >= self.next_spawn_turns[p_type]:
                 if len(self.all_pickups) < Gameplay.MAX_PICKUPS:
                     # Check rarity
-                    if random.random() < config["rarity"]:
+                    if self.rng.pickups.random() < config["rarity"]:
                         x, y = self.get_random_spawn_location(grid)
                         self.spawn_single_pickup(x, y, p_type, self.turn_count)
                     else:
                         # Not spawned this turn, try again soon
-                        self.next_spawn_turns[p_type] = self.turn_count + random.randint(1, 3)
+                        self.next_spawn_turns[p_type] = self.turn_count + self.rng.pickups.randint(1, 3)
 
 
 
@@ -104,6 +106,14 @@ class Pickup:
         """Create and store a single pickup item instance."""
         new_pickup = Pickup(x, y, overlay, spawn_turn)
         self.all_pickups.append(new_pickup)
+        self.by_tile.setdefault((x, y), []).append(new_pickup)
+
+
+
+
+    def pickups_at(self, x, y):
+        """Pickups lying on (x, y), as a list the caller may pick from while iterating (manager only)."""
+        return list(self.by_tile.get((x, y), ()))
 
 
 
@@ -114,9 +124,9 @@ class Pickup:
             return
         for p in self.all_pickups:
             if not p.picked and (p.x, p.y) in visible_tiles:
-                texture = self.textures_file[p.overlay]
+                texture = atlas.get(p.overlay, (CELL_SIZE // 2, CELL_SIZE // 2))
                 rect = pygame.Rect(p.x * CELL_SIZE+CELL_SIZE/4, p.y * CELL_SIZE+CELL_SIZE/4, CELL_SIZE/2, CELL_SIZE/2)
-                screen.blit(pygame.transform.scale(texture, (CELL_SIZE/2, CELL_SIZE/2)), rect)
+                screen.blit(texture, rect)
 
 
 
@@ -141,9 +151,6 @@ class Pickup:
                 for ability in unit.abilities:
                     unit.crit_chance += 5
 
-        # Play the potion sound
-        self.sound.play("potion")
-
         #mark as picked and remove
         pickup.picked = True
         self.remove_pickup(pickup)
@@ -155,7 +162,11 @@ class Pickup:
         """Remove a pickup and schedule next spawn attempt (manager only)."""
         if pickup in self.all_pickups:
             self.all_pickups.remove(pickup)
-        delay = random.randint(Gameplay.PICKUP_SPAWN_MIN_DELAY, Gameplay.PICKUP_SPAWN_MAX_DELAY)
+            tile = self.by_tile[(pickup.x, pickup.y)]
+            tile.remove(pickup)
+            if not tile:
+                del self.by_tile[(pickup.x, pickup.y)]
+        delay = self.rng.pickups.randint(Gameplay.PICKUP_SPAWN_MIN_DELAY, Gameplay.PICKUP_SPAWN_MAX_DELAY)
         self.next_spawn_turns[pickup.overlay] = self.turn_count + delay
 
 
@@ -164,8 +175,8 @@ class Pickup:
     def get_random_spawn_location(self, grid):
         """Get a random allowed cell for spawning."""
         while True:
-            x = random.randint(0, GRID_SIZE - 1)
-            y = random.randint(0, GRID_SIZE - 1)
+            x = self.rng.pickups.randint(0, GRID_SIZE - 1)
+            y = self.rng.pickups.randint(0, GRID_SIZE - 1)
             tile_type = grid.tiles[x][y].terrain
             if tile_type in self.allowed_tile_types :
                 return x, y
@@ -176,6 +187,98 @@ class Pickup:
 # permanently increases the critical chance by 10%        
 
 
+def wrap_text(font, text, max_width):
+    """Split text into lines no wider than max_width (measured, not rendered)."""
+    lines = []
+    current_line = ""
+    for word in text.split(" "):
+        test_line = f"{current_line} {word}".strip()
+        if font.size(test_line)[0] > max_width and current_line:
+            lines.append(current_line)
+            current_line = word
+        else:
+            current_line = test_line
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+
+
+class EventLog:
+    """Scrollable battle log history; each message is word-wrapped once, when it is logged."""
+    def __init__(self, max_events=UI.EVENT_LOG_HISTORY):
+        self.events = deque(maxlen=max_events)  # (message, wrapped lines), oldest first
+        self.scroll = 0  # How many of the newest events are scrolled past
+        self.version = 0  # Bumped whenever the visible log changes
+        self.backgrounds = {}  # (height, alpha) -> event background surface
+
+
+
+
+    def add(self, message):
+        """Store a message together with its wrapped layout."""
+        font = fonts.get(None, UI.EVENT_LOG_FONT_SIZE)
+        max_line_width = UI.INFO_PANEL_WIDTH - 2 * UI.INFO_PANEL_PADDING
+        self.events.append((message, wrap_text(font, message, max_line_width)))
+        if self.scroll:
+            self.scroll = min(self.scroll + 1, len(self.events) - 1)  # Keep the scrolled view still
+        self.version += 1
+
+
+
+
+    def scroll_by(self, delta):
+        """Scroll towards older (positive) or newer (negative) events."""
+        scroll = max(0, min(self.scroll + delta, len(self.events) - 1))
+        if scroll != self.scroll:
+            self.scroll = scroll
+            self.version += 1
+
+
+
+
+    def background(self, width, height, alpha):
+        """Translucent event background, built once per (height, alpha)."""
+        key = (height, alpha)
+        surface = self.backgrounds.get(key)
+        if surface is None:
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            surface.fill((40, 45, 55, min(alpha, 150)))
+            self.backgrounds[key] = surface
+        return surface
+
+
+
+
+    def draw(self, screen, x, y, width, bottom):
+        """Draw the newest events (after scrolling) from y downwards until bottom is reached."""
+        font = fonts.get(None, UI.EVENT_LOG_FONT_SIZE)
+        line_height = font.get_height() + 4
+        line_spacing = 8
+
+        shown = islice(reversed(self.events), self.scroll, self.scroll + UI.EVENT_LOG_MAX_EVENTS)
+        for idx, (_, lines) in enumerate(shown):
+            # Fade older events
+            alpha = max(255 - (idx * 15), 100)
+
+            # Event background
+            screen.blit(self.background(width, len(lines) * line_height + 8, alpha), (x, y - 4))
+
+            # Event text, already wrapped
+            for line in lines:
+                screen.blit(text_cache.render(font, line, (255, 255, 255), alpha=alpha), (x + 5, y))
+                y += line_height
+
+            y += line_spacing
+
+            # Stop if panel is full
+            if y > bottom:
+                break
+
+
+
+
 # Grid Class
 class Grid:
     """Manages the entire grid."""
@@ -184,6 +287,10 @@ class Grid:
         self.textures_file = textures_file
         self.tiles = self.create_grid()
         self.highlight=Highlight(self.textures_file)
+        self.layer = None  # Pre-rendered terrain, built on first draw
+        self.dirty_cells = set()  # Cells to repaint before the next draw
+        self.version = 0  # Bumped on every terrain change
+        self.reachable_cache = {}  # (x, y, move_range) -> reachable cells, valid for the current version
         
 
 
@@ -212,11 +319,196 @@ class Grid:
 
 
 
-    def draw(self, screen):
-        """Draw all tiles in the grid."""
+    def invalidate(self, positions=None):
+        """
+        Mark terrain cells for repainting after their terrain or overlay changed.
+        :param positions: Iterable of (x, y) cells, or None to rebuild the whole layer.
+        """
+        self.version += 1
+        self.reachable_cache.clear()
+        if positions is None:
+            self.layer = None
+            self.dirty_cells.clear()
+        elif self.layer is not None:
+            self.dirty_cells.update(positions)
+
+
+
+
+    def reachable_tiles(self, x, y, move_range):
+        """
+        Cells a unit starting at (x, y) can reach with move_range movement points (Dijkstra over move costs).
+        Results are cached until the terrain changes.
+        :return: Frozenset of reachable (x, y) cells.
+        """
+        key = (x, y, move_range)
+        reachable = self.reachable_cache.get(key)
+        if reachable is not None:
+            return reachable
+
+        best = {(x, y): 0}  # Cheapest known cost to each cell
+        heap = [(0, x, y)]
+        cells = set()
+        while heap:
+            cost, cx, cy = heapq.heappop(heap)
+            if cost > best[(cx, cy)] or not self.tiles[cx][cy].traversable:
+                continue  # Stale queue entry, or a tile units can't stand on
+            cells.add((cx, cy))
+
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < self.size and 0 <= ny < self.size:
+                    next_cost = cost + self.tiles[nx][ny].move_cost
+                    if next_cost <= move_range and next_cost < best.get((nx, ny), next_cost + 1):
+                        best[(nx, ny)] = next_cost
+                        heapq.heappush(heap, (next_cost, nx, ny))
+
+        reachable = frozenset(cells)
+        self.reachable_cache[key] = reachable
+        return reachable
+
+
+
+
+    def render_layer(self):
+        """Composite every tile into the static terrain layer."""
+        self.layer = prepare_surface(pygame.Surface((self.size * CELL_SIZE, self.size * CELL_SIZE)))
         for row in self.tiles:
             for tile in row:
-                tile.draw_tile(screen)
+                tile.draw_tile(self.layer)
+        self.dirty_cells.clear()
+
+
+
+
+    def draw(self, screen):
+        """Draw the terrain with a single blit of the pre-rendered layer."""
+        if self.layer is None:
+            self.render_layer()
+        elif self.dirty_cells:
+            for x, y in self.dirty_cells:
+                self.tiles[x][y].draw_tile(self.layer)
+            self.dirty_cells.clear()
+        screen.blit(self.layer, (0, 0))
+
+
+
+
+
+# Fog Overlay Class
+class FogOverlay:
+    """Fog and edge dimming for the whole map, pre-composited into one surface."""
+    def __init__(self, size):
+        self.size = size
+        self.surface = pygame.Surface((size * CELL_SIZE, size * CELL_SIZE), pygame.SRCALPHA)
+        self.version = None  # Fog version the surface was last built for
+
+
+
+
+    def update(self, visible_tiles, version):
+        """Rebuild the overlay if the visible tiles changed since the last build."""
+        if version == self.version:
+            return
+        self.version = version
+        size = self.size
+
+        # Visibility mask with a one-cell border that is always dark
+        stride = size + 2
+        lit = bytearray(stride * stride)
+        for x, y in visible_tiles:
+            lit[(x + 1) * stride + y + 1] = 1
+
+        self.surface.fill((0, 0, 0, 0))
+        for x in range(size):
+            for y in range(size):
+                i = (x + 1) * stride + y + 1
+                rect = (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                if not lit[i]:
+                    self.surface.fill(Colors.FOG_OVERLAY, rect)  # Fully fogged areas
+                elif not (lit[i - stride] and lit[i + stride] and lit[i - 1] and lit[i + 1]):
+                    self.surface.fill(Colors.DIM_OVERLAY, rect)  # Dim lighting at the edges of visibility
+
+
+
+
+
+def cursor_alpha(ticks):
+    """Alpha of the pulsing target cursor at `ticks` ms (one beat per second)."""
+    return int(180 + 70 * (ticks % 1000 / 500 - 1))
+
+
+
+
+class RangeOverlays:
+    """
+    Highlight surfaces built once and reused every frame: one per (radius, color) Manhattan disc,
+    one for the current movement range, and the target cursor at each pulse alpha.
+    """
+    def __init__(self):
+        self.map_rect = pygame.Rect(0, 0, GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE)
+        self.discs = {}  # (radius, color) -> surface covering the disc's bounding square
+        self.move_tiles = None  # Reachable tiles the movement surface was built for
+        self.move_surface = None
+        self.move_origin = (0, 0)  # Tile at the movement surface's top-left corner
+        self.cursors = {}  # alpha -> target cursor faded to it
+
+
+
+
+    def disc(self, radius, color):
+        """Tiles within Manhattan distance `radius` of the center, filled with `color`, on one surface."""
+        key = (radius, color)
+        surface = self.discs.get(key)
+        if surface is None:
+            side = (2 * radius + 1) * CELL_SIZE
+            surface = pygame.Surface((side, side), pygame.SRCALPHA)
+            for dx, dy in disc_offsets(radius):
+                surface.fill(color, ((dx + radius) * CELL_SIZE, (dy + radius) * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            self.discs[key] = surface
+        return surface
+
+
+
+
+    def movement(self, tiles):
+        """Surface highlighting `tiles`, rebuilt only when the set of reachable tiles changes."""
+        if tiles is not self.move_tiles:
+            self.move_tiles = tiles
+            if not tiles:
+                self.move_surface = None
+                return None, self.move_origin
+            left = min(x for x, _ in tiles)
+            top = min(y for _, y in tiles)
+            width = max(x for x, _ in tiles) - left + 1
+            height = max(y for _, y in tiles) - top + 1
+            self.move_surface = pygame.Surface((width * CELL_SIZE, height * CELL_SIZE), pygame.SRCALPHA)
+            for x, y in tiles:
+                self.move_surface.fill(Colors.MOVE_HIGHLIGHT, ((x - left) * CELL_SIZE, (y - top) * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            self.move_origin = (left, top)
+        return self.move_surface, self.move_origin
+
+
+
+
+    def cursor(self, alpha):
+        """The target cursor (pre-scaled by the atlas) at one alpha of its pulse."""
+        sprite = self.cursors.get(alpha)
+        if sprite is None:
+            sprite = atlas.get("redsquare", (UI.TARGET_INDICATOR_SIZE, UI.TARGET_INDICATOR_SIZE)).copy()
+            sprite.set_alpha(alpha)
+            self.cursors[alpha] = sprite
+        return sprite
+
+
+
+
+    def blit_on_map(self, screen, surface, tile_x, tile_y):
+        """Blit `surface` with its top-left corner on tile (tile_x, tile_y), clipped to the map."""
+        position = (tile_x * CELL_SIZE, tile_y * CELL_SIZE)
+        target = pygame.Rect(position, surface.get_size()).clip(self.map_rect)
+        if target.width > 0 and target.height > 0:
+            screen.blit(surface, target, target.move(-position[0], -position[1]))
 
 
 
@@ -228,44 +520,21 @@ class Highlight:
     def __init__(self,textures_file):
         
         self.visible_tiles = set()
+        self.fog_version = 0  # Changes whenever visible_tiles changes
         self.textures_file=textures_file
         
 
 
 
-    def highlight_range(self, unit):
+    def highlight_range(self, unit, screen):
         """Highlight movement or attack range based on the unit's state."""
-        overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)  # Transparent overlay
-
-        for row in self.grid.tiles:
-            for tile in row:
-                tile.highlighted = False 
+        overlays = self.range_overlays
 
         if unit.state == "move":
-            visited = set()
-            queue = [(unit.initial_x, unit.initial_y, 0)]  # (x, y, current_distance)
-            
-            while queue:
-                x, y, cost = queue.pop(0)
-                if (x, y) in visited or cost > unit.move_range:  # Skip already visited or out-of-range tiles
-                    continue
-                visited.add((x, y))
-
-                if self.grid.tiles[x][y].traversable:
-                    self.grid.tiles[x][y].highlighted = True
-                    overlay.fill(Colors.MOVE_HIGHLIGHT)
-                    rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    self.screen.blit(overlay, rect)  # Highlight this tile
-
-                    # Check cardinal directions for next tiles
-                    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:  # Ensure within bounds
-                            next_cost = cost + self.grid.tiles[nx][ny].move_cost
-                            if next_cost <= unit.move_range and (nx, ny) not in visited:
-                                queue.append((nx, ny, next_cost))
-
-                        
+            surface, (left, top) = overlays.movement(self.grid.reachable_tiles(unit.initial_x, unit.initial_y, unit.move_range))
+            if surface is not None:
+                overlays.blit_on_map(screen, surface, left, top)
+
         elif unit.state == "attack":
             # Determine the current attack range based on the selected ability
             if unit.selected_ability is not None:
@@ -276,34 +545,16 @@ class Highlight:
                 aoe_range = 0
 
             # Highlight the attack range
-            for dx in range(-attack_range, attack_range + 1):
-                for dy in range(-attack_range, attack_range + 1):
-                    x, y = unit.x + dx, unit.y + dy
-                    if (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE and
-                            abs(dx) + abs(dy) <= attack_range):  # Manhattan distance restriction
-                        overlay.fill(Colors.ABILITY_HIGHLIGHT if unit.selected_ability else Colors.ATTACK_HIGHLIGHT)
-                        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        self.screen.blit(overlay, rect)
-
-
-            for dx in range(-aoe_range,aoe_range+1):
-                for dy in range(-aoe_range,aoe_range+1):
-                    x, y = unit.target_x + dx, unit.target_y + dy
+            color = Colors.ABILITY_HIGHLIGHT if unit.selected_ability else Colors.ATTACK_HIGHLIGHT
+            overlays.blit_on_map(screen, overlays.disc(attack_range, color), unit.x - attack_range, unit.y - attack_range)
 
-                    if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE and abs(dx) + abs(dy) <= aoe_range:
-                    # Highlight the target cursor
-                        target_rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        beat_scale = 100  # Indicator scale percentage
-                        beat_alpha = 180 + 70 * (pygame.time.get_ticks() % 1000 / 500 - 1)  # Smoother alpha transition
-                        indicator_size = int(CELL_SIZE * beat_scale / 100)*1.2  # Scale the indicator image
-                        indicator_image = pygame.transform.scale(self.indicators["redsquare"], (indicator_size, indicator_size))
-                        indicator_image.set_alpha(beat_alpha)
-
-                        # Center the scaled indicator within the target tile
-                        indicator_x = target_rect.x + (CELL_SIZE - indicator_size) // 2
-                        indicator_y = target_rect.y + (CELL_SIZE - indicator_size) // 2
-
-                        self.screen.blit(indicator_image, (indicator_x, indicator_y))
+            # Pulse the target cursor over every tile the attack would hit
+            cursor = overlays.cursor(cursor_alpha(pygame.time.get_ticks()))
+            inset = (CELL_SIZE - UI.TARGET_INDICATOR_SIZE) // 2  # Center the cursor within the tile
+            for dx, dy in disc_offsets(aoe_range):
+                x, y = unit.target_x + dx, unit.target_y + dy
+                if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
+                    screen.blit(cursor, (x * CELL_SIZE + inset, y * CELL_SIZE + inset))
 
 
 
@@ -311,79 +562,22 @@ class Highlight:
     def update_fog_visibility(self, team_color):
         """
         Update the set of visible tiles based on all members of the team.
+        Only units that moved, died or gained range since the last call are re-walked (see fog.py).
         :param team_color: Color of the current team.
         """
-        self.visible_tiles = set()  # Reset visible tiles
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Light propagation directions
-
-        # Process visibility for each unit on the team
-        for unit in self.units:
-            if unit.color == team_color and unit.alive:
-
-                # BFS for this unit's visibility
-                queue = [(unit.x, unit.y, 0)]  # BFS queue: (x, y, distance)
-                max_visibility = unit.move_range + 2  # Visibility range slightly larger than movement
-
-                # Local set to track tiles visible by this unit
-                unit_visible_tiles = set()
-
-                while queue:
-                    x, y, distance = queue.pop(0)
-
-                    # Stop propagation if the distance exceeds the visibility range
-                    if distance > max_visibility:
-                        continue
-
-                    # Mark tile as visible for this unit
-                    unit_visible_tiles.add((x, y))
-
-                    # Propagate light in all directions
-                    for dx, dy in directions:
-                        nx, ny = x + dx, y + dy
-                        if (
-                            0 <= nx < GRID_SIZE
-                            and 0 <= ny < GRID_SIZE
-                            and (nx, ny) not in unit_visible_tiles
-                            and distance + 1 <= max_visibility
-                        ):
-                            # If the tile is non-traversable, stop propagation in this direction
-                            if not self.grid.tiles[nx][ny].traversable:
-                                unit_visible_tiles.add((nx, ny))  # Add for visual accuracy
-                                continue
-
-                            # Add to queue to continue propagation
-                            queue.append((nx, ny, distance + 1))
-
-                # Add this unit's visibility to the team's visibility
-                self.visible_tiles.update(unit_visible_tiles)
-                
-                
+        self.visible_tiles = self.fog.update(self.units, team_color)
+        self.fog_version = (team_color, self.fog.versions[team_color])  # Changes only when the visible set does
+        
 
-        # Final combined visible tiles
-    def draw_fog(self, screen):
-        """Draw the fog of war and dim lighting based on the visible tiles."""
-        fog_overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-        fog_overlay.fill(Colors.FOG_OVERLAY)
 
-        dim_overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-        dim_overlay.fill(Colors.DIM_OVERLAY)
 
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Light propagation directions
+    def draw_fog(self, screen):
+        """Draw the fog of war and dim lighting based on the visible tiles."""
+        self.fog_overlay.update(self.visible_tiles, self.fog_version)
+        screen.blit(self.fog_overlay.surface, (0, 0))
 
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                if (x, y) not in self.visible_tiles:
-                    # Fully fogged areas
-                    screen.blit(fog_overlay, rect)   
-                elif (x, y) in self.visible_tiles and any(
-                    (x + dx, y + dy) not in self.visible_tiles for dx, dy in directions
-                ):
-                    # Dim lighting at the edges of visibility
-                    screen.blit(dim_overlay, rect)
 
 
-                    
 
     def show_buff_animation(self, screen, buff_image, key_message="You won a key"):
         """Display a buff animation after a monster is defeated."""
@@ -427,11 +621,11 @@ class Highlight:
 
 
             if time_elapsed > duration - 1500:
-                font = pygame.font.Font(Assets.FONT_RUSSO, 50)
-                text_surface = font.render(key_message, True, Colors.BLACK)
+                font = fonts.get(Assets.FONT_RUSSO, 50)
+                text_surface = text_cache.render(font, key_message, Colors.BLACK)
                 text_rect = text_surface.get_rect(center=(center_x, center_y + 100))
                 screen.blit(text_surface, text_rect)
-                text_surface1 = font.render(key_message, True, Colors.GREEN)
+                text_surface1 = text_cache.render(font, key_message, Colors.GREEN)
                 text_rect1 = text_surface1.get_rect(center=(center_x + 2, center_y + 102))
                 screen.blit(text_surface1, text_rect1)
 
@@ -2,8 +2,38 @@
 League on Budget - Main Entry Point
 A 2D turn-based tactical combat game inspired by League of Legends
 """
+import argparse
+from profiler import profiler  # First import, so startup is timed from here
 from game import Game
+from rng import random_service
+from constants import RENDER_MODE, Gameplay
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="League on Budget")
+    parser.add_argument("--render", choices=["full", "dirty"], default=RENDER_MODE,
+                        help="full redraws every frame, dirty only repaints what changed")
+    parser.add_argument("--profile-startup", nargs="?", const="-", metavar="PATH",
+                        help="print the time spent in each startup stage, or write it as JSON to PATH")
+    parser.add_argument("--seed", type=int,
+                        help="master seed for combat, pickups and effects, to replay the same match")
+    parser.add_argument("--ai", choices=["blue", "red", "both"],
+                        help="let the computer play this team (or both)")
+    parser.add_argument("--ai-search", choices=["mcts", "alphabeta"], default="mcts",
+                        help="how the computer picks its moves: Monte Carlo tree search or alpha-beta minimax")
+    parser.add_argument("--ai-time", type=float, default=Gameplay.AI_THINK_TIME_S, metavar="SECONDS",
+                        help="time the computer may think about each turn")
+    parser.add_argument("--ai-iterations", type=int,
+                        help="MCTS: stop thinking after this many search playouts (with --ai-time as a cap)")
+    parser.add_argument("--ai-depth", type=int, default=Gameplay.AI_SEARCH_DEPTH,
+                        help="alpha-beta: unit-turns to look ahead (with --ai-time as a cap)")
+    args = parser.parse_args()
+    profiler.output = args.profile_startup
+    random_service.seed(args.seed)
+
+    ai_teams = ["blue", "red"] if args.ai == "both" else [args.ai] if args.ai else []
+    if args.ai_search == "mcts":
+        ai_options = {"iterations": args.ai_iterations, "think_time": args.ai_time}
+    else:
+        ai_options = {"depth": args.ai_depth, "think_time": args.ai_time}
+    game = Game(render_mode=args.render, ai_teams=ai_teams, ai_policy=args.ai_search, ai_options=ai_options)
     game.run()
@@ -0,0 +1,193 @@
+"""
+Particles - Fixed-capacity particle pool stored as parallel arrays, with pre-rendered sprites
+
+With NumPy installed the pool is a set of NumPy arrays: a frame's update is a few slice operations over
+the live particles, and drawing stamps every particle into one shared layer blitted once. Without it the
+pool uses array.array and the same steps run particle by particle.
+"""
+from array import array
+import pygame
+from constants import CELL_SIZE, Gameplay
+from rng import random_service
+
+try:
+    import numpy
+except ImportError:  # Optional: the pure Python path keeps the same pool contents, only slower
+    numpy = None
+
+
+
+
+class ParticleSystem:
+    """
+    Struct-of-arrays particle pool: one typed array per attribute, live particles packed at the front
+    in spawn order. Dead particles are compacted away after each update, so spawning never allocates
+    once the pool exists.
+    """
+    def __init__(self, capacity=Gameplay.PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0  # Live particles occupy indices [0, count)
+        if numpy is not None:
+            self.x, self.y, self.vx, self.vy = (numpy.zeros(capacity) for _ in range(4))
+            self.life, self.size, self.color = (numpy.zeros(capacity, dtype=numpy.int32) for _ in range(3))
+        else:
+            self.x, self.y, self.vx, self.vy = (array("d", bytes(8 * capacity)) for _ in range(4))
+            self.life, self.size, self.color = (array("i", bytes(4 * capacity)) for _ in range(3))
+        self.colors = []  # RGB tuples indexed by self.color; a handful of distinct colors
+        self.color_index = {}  # RGB tuple -> index in self.colors
+        self.sprites = {}  # (size, color index, life) -> pre-rendered circle at that life's alpha
+        self.footprints = {}  # size -> (dx, dy) offsets of the pixels a particle's circle covers
+        self.rng = random_service  # Particles draw from the cosmetics stream only
+
+
+
+
+    def __len__(self):
+        return self.count
+
+
+
+
+    def clear(self):
+        """Drop every particle (the pool itself is kept)."""
+        self.count = 0
+
+
+
+
+    def spawn(self, x, y, color, count=10):
+        """Burst `count` particles from the center of tile (x, y). Particles beyond capacity are dropped."""
+        px = x * CELL_SIZE + CELL_SIZE // 2
+        py = y * CELL_SIZE + CELL_SIZE // 2
+        color = tuple(color[:3])
+        index = self.color_index.get(color)
+        if index is None:
+            index = self.color_index[color] = len(self.colors)
+            self.colors.append(color)
+        rng = self.rng.cosmetics
+        for _ in range(min(count, self.capacity - self.count)):
+            i = self.count
+            self.x[i] = px
+            self.y[i] = py
+            self.vx[i] = rng.uniform(-2, 2)
+            self.vy[i] = rng.uniform(-3, -1)
+            self.life[i] = rng.randint(20, Gameplay.PARTICLE_MAX_LIFE)
+            self.size[i] = rng.randint(2, 5)
+            self.color[i] = index
+            self.count += 1
+
+
+
+
+    def update(self):
+        """Advance every particle one frame and compact the survivors to the front, in order."""
+        n = self.count
+        gravity = Gameplay.PARTICLE_GRAVITY
+        columns = (self.x, self.y, self.vx, self.vy, self.life, self.size, self.color)
+        if numpy is not None:
+            self.x[:n] += self.vx[:n]
+            self.y[:n] += self.vy[:n]
+            self.vy[:n] += gravity
+            self.life[:n] -= 1
+            alive = self.life[:n] > 0
+            count = int(numpy.count_nonzero(alive))
+            if count < n:
+                for values in columns:
+                    values[:count] = values[:n][alive]
+            self.count = count
+            return
+
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        count = 0
+        for i in range(n):
+            x[i] += vx[i]
+            y[i] += vy[i]
+            vy[i] += gravity
+            life[i] -= 1
+            if life[i] > 0:
+                if count != i:
+                    for values in columns:
+                        values[count] = values[i]
+                count += 1
+        self.count = count
+
+
+
+
+    def sprite(self, size, color, life):
+        """Circle sprite for one (size, color index, life), faded with the remaining life."""
+        key = (size, color, life)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            alpha = int(255 * (life / Gameplay.PARTICLE_MAX_LIFE))
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.colors[color], alpha), (size // 2, size // 2), size // 2)
+            self.sprites[key] = sprite
+        return sprite
+
+
+
+
+    def footprint(self, size):
+        """Pixel offsets covered by the circle of a `size` particle, as drawn by sprite()."""
+        offsets = self.footprints.get(size)
+        if offsets is None:
+            circle = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(circle, (255, 255, 255, 255), (size // 2, size // 2), size // 2)
+            covered = [(dx, dy) for dx in range(size) for dy in range(size) if circle.get_at((dx, dy)).a]
+            offsets = self.footprints[size] = numpy.array(covered, dtype=numpy.int64).reshape(-1, 2).T
+        return offsets
+
+
+
+
+    def draw(self, surface):
+        """
+        Draw every live particle. With NumPy, the particles' circles are stamped into one transparent layer
+        around them, blitted once (where particles overlap, one covers the other instead of blending);
+        otherwise each sprite is blitted in one batched call.
+        """
+        n = self.count
+        if not n:
+            return
+        if numpy is None:
+            sprites = self.sprites
+            batch = []
+            for x, y, size, color, life in zip(self.x[:n], self.y[:n], self.size[:n], self.color[:n], self.life[:n]):
+                sprite = sprites.get((size, color, life))
+                if sprite is None:
+                    sprite = self.sprite(size, color, life)
+                batch.append((sprite, (int(x), int(y))))
+            surface.blits(batch, False)
+            return
+
+        area = self.bounds()
+        width, height = area.size
+        # One pixel per uint32, little-endian so its bytes read B, G, R, A on any machine: the layout of
+        # display surfaces, which makes the blit a plain alpha blend
+        layer = numpy.zeros(width * height, dtype="<u4")
+        corner = (self.y[:n].astype(numpy.int64) - area.top) * width + (self.x[:n].astype(numpy.int64) - area.left)
+        palette = numpy.array([b | g << 8 | r << 16 for r, g, b in self.colors], dtype="<u4")
+        alpha = (255 * (self.life[:n] / Gameplay.PARTICLE_MAX_LIFE)).astype("<u4")  # Truncated like int()
+        pixel = palette[self.color[:n]] | alpha << 24
+        sizes = self.size[:n]
+        for size in numpy.unique(sizes):
+            chosen = sizes == size
+            dx, dy = self.footprint(int(size))
+            offsets = dy * width + dx
+            layer[(corner[chosen, None] + offsets).ravel()] = numpy.repeat(pixel[chosen], len(offsets))
+        surface.blit(pygame.image.frombuffer(layer, area.size, "BGRA"), area.topleft)
+
+
+
+
+    def bounds(self):
+        """Single rect around every live particle, or None when there are none."""
+        n = self.count
+        if not n:
+            return None
+        low, high = (numpy.min, numpy.max) if numpy is not None else (min, max)
+        xs, ys = self.x[:n], self.y[:n]
+        largest = int(high(self.size[:n]))
+        left, top = int(low(xs)), int(low(ys))
+        return pygame.Rect(left, top, int(high(xs)) - left + largest, int(high(ys)) - top + largest)
@@ -0,0 +1,101 @@
+"""
+Startup profiling - Time spent in each loading stage, printed as a table or dumped as JSON
+"""
+import json
+import time
+from contextlib import contextmanager
+
+
+
+
+class StartupProfiler:
+    """
+    Records how long each startup stage takes, when milestones (first menu frame...) are reached, and what
+    the frames drawn while loading cost (each one delays the next load stage).
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []  # (name, start_ms, duration_ms), in the order they ran
+        self.marks = []   # (name, ms since start)
+        self.frames = {}  # name -> [frames drawn, total ms, slowest ms]
+        self.output = None  # None stays quiet, "-" prints the report, anything else is a JSON file path
+        self.reported = False
+
+
+
+
+    def elapsed_ms(self):
+        """Milliseconds since the profiler was created (i.e. since startup)."""
+        return (time.perf_counter() - self.started) * 1000
+
+
+
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one startup stage."""
+        begin = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.stages.append((name, begin, self.elapsed_ms() - begin))
+
+
+
+
+    def frame(self, name, began):
+        """Add one frame of the screen `name`, drawn since elapsed_ms() returned `began`, to its totals."""
+        duration = self.elapsed_ms() - began
+        frames = self.frames.setdefault(name, [0, 0.0, 0.0])
+        frames[0] += 1
+        frames[1] += duration
+        frames[2] = max(frames[2], duration)
+
+
+
+
+    def mark(self, name):
+        """Record that a milestone was reached."""
+        self.marks.append((name, self.elapsed_ms()))
+
+
+
+
+    def as_dict(self):
+        """Report as plain data, ready for json.dump."""
+        return {
+            "stages": [{"name": name, "start_ms": round(start, 2), "duration_ms": round(duration, 2)}
+                       for name, start, duration in self.stages],
+            "marks": {name: round(at, 2) for name, at in self.marks},
+            "frames": {name: {"count": count, "mean_ms": round(total / count, 2), "max_ms": round(slowest, 2)}
+                       for name, (count, total, slowest) in self.frames.items()},
+            "total_ms": round(sum(duration for _, _, duration in self.stages), 2),
+        }
+
+
+
+
+    def report(self):
+        """Print or dump the report once, if an output was requested."""
+        if self.output is None or self.reported:
+            return
+        self.reported = True
+
+        if self.output != "-":
+            with open(self.output, "w") as file:
+                json.dump(self.as_dict(), file, indent=2)
+            return
+
+        print("Startup profile:")
+        for name, start, duration in self.stages:
+            print(f"  {name:<24} {duration:8.1f} ms   (at {start:8.1f} ms)")
+        for name, at in self.marks:
+            print(f"  * {name:<22} at {at:8.1f} ms")
+        for name, (count, total, slowest) in self.frames.items():
+            print(f"  {name:<24} {total / count:8.1f} ms   (mean of {count}, slowest {slowest:.1f} ms)")
+
+
+
+
+# Created when the game modules are imported, so stages are measured from startup
+profiler = StartupProfiler()
@@ -0,0 +1,100 @@
+"""
+Frame compositing - Dirty-rectangle rendering of the game layers
+"""
+import pygame
+from constants import *
+
+MAX_DIRTY_REGIONS = 8  # Above this many regions, repaint their bounding box instead
+
+
+
+
+class Layer:
+    """One drawable part of the frame (grid, fog, units, HUD...)."""
+    def __init__(self, name, draw, state, bounds):
+        self.name = name
+        self.draw = draw      # Draws the layer on the surface it is given
+        self.state = state    # Returns a hashable snapshot of what the layer shows
+        self.bounds = bounds  # Returns the list of rects the layer covers
+        self.last_state = None
+        self.last_rects = []
+
+
+
+
+def merge_rects(rects, limit=MAX_DIRTY_REGIONS):
+    """Merge overlapping rects so each screen area is repainted once."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        # Absorb every region this rect touches, then repeat with the grown rect
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+
+    if len(merged) > limit:
+        return [merged[0].unionall(merged[1:])]
+    return merged
+
+
+
+
+class Compositor:
+    """Repaints only the screen regions whose layers changed since the last frame."""
+    def __init__(self, screen, layers):
+        self.screen = screen  # Surface the layers are composed on (the game's offscreen frame buffer)
+        self.layers = layers
+        self.full_redraw_pending = True
+
+
+
+
+    def invalidate(self):
+        """Force the next frame to repaint the whole screen (e.g. after a menu or animation)."""
+        self.full_redraw_pending = True
+
+
+
+
+    def collect_dirty_rects(self):
+        """Compare every layer with its last drawn state and collect the rects to repaint."""
+        dirty = []
+        for layer in self.layers:
+            state = layer.state()
+            if self.full_redraw_pending or state != layer.last_state:
+                rects = layer.bounds()
+                dirty.extend(layer.last_rects)
+                dirty.extend(rects)
+                layer.last_state = state
+                layer.last_rects = rects
+
+        if self.full_redraw_pending:
+            self.full_redraw_pending = False
+            return [self.screen.get_rect()]
+        return dirty
+
+
+
+
+    def render(self):
+        """
+        Redraw the layers inside the changed regions only.
+        :return: List of repainted rects, to present with pygame.display.update (empty when nothing changed).
+        """
+        screen_rect = self.screen.get_rect()
+        regions = [region.clip(screen_rect) for region in merge_rects(self.collect_dirty_rects())]
+        regions = [region for region in regions if region.width > 0 and region.height > 0]
+
+        for region in regions:
+            self.screen.set_clip(region)
+            self.screen.fill(Colors.BLACK, region)
+            for layer in self.layers:
+                # Skip layers that draw nowhere near this region
+                if region.collidelist(layer.last_rects) != -1:
+                    layer.draw(self.screen)
+        self.screen.set_clip(None)
+        return regions
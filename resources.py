@@ -0,0 +1,198 @@
+"""
+Shared render resources - Textures, fonts and rendered text cached once and reused by every draw call
+"""
+import pygame
+from collections import OrderedDict
+from bundle import bundle
+from constants import CELL_SIZE, UI
+
+
+def prepare_surface(surface):
+    """Convert a surface to the display pixel format once a display exists."""
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+
+
+class ImageRegistry:
+    """Decodes every image file once per process and shares the surface with all its users."""
+    def __init__(self):
+        self.images = {}  # path -> decoded surface
+        self.converted = set()  # paths whose surface is already in the display format
+
+
+
+
+    def load(self, path):
+        """
+        Return the image at `path`, decoding it on first use.
+        The surface is converted to the display format as soon as a display exists.
+        """
+        image = self.images.get(path)
+        if image is None:
+            image = bundle.image(path)  # Pre-decoded pixels, when an up-to-date bundle exists
+            if image is None:
+                image = pygame.image.load(path)
+            self.images[path] = image
+        if path not in self.converted and pygame.display.get_surface() is not None:
+            image = prepare_surface(image)
+            self.images[path] = image
+            self.converted.add(path)
+        return image
+
+
+
+
+class TextureAtlas:
+    """Keeps every texture pre-scaled to the sizes it is drawn at."""
+    def __init__(self):
+        self.sources = {}  # name -> original image
+        self.scaled = {}   # (name, (width, height)) -> converted, scaled image
+
+
+
+
+    def register(self, images, size=(CELL_SIZE, CELL_SIZE)):
+        """
+        Register named images and pre-scale them to the given size.
+        :param images: Dict of name -> loaded image.
+        :param size: Size the images are drawn at.
+        :return: Dict of name -> scaled image, ready to blit.
+        """
+        ready = {}
+        for name, image in images.items():
+            self.add(name, image)
+            ready[name] = self.get(name, size)
+        return ready
+
+
+
+
+    def add(self, name, image):
+        """Register a source image, dropping stale scaled copies if it changed."""
+        if self.sources.get(name) is image:
+            return
+        self.sources[name] = image
+        for key in [key for key in self.scaled if key[0] == name]:
+            del self.scaled[key]
+
+
+
+
+    def get(self, name, size=(CELL_SIZE, CELL_SIZE)):
+        """Return the image registered as `name` scaled to `size`, scaling it on first use."""
+        size = (int(size[0]), int(size[1]))
+        key = (name, size)
+        surface = self.scaled.get(key)
+        if surface is None:
+            surface = prepare_surface(pygame.transform.scale(self.sources[name], size))
+            self.scaled[key] = surface
+        return surface
+
+
+
+
+class FontRegistry:
+    """Opens each (font file, size) pair once instead of on every draw."""
+    def __init__(self):
+        self.fonts = {}  # (path, size) -> pygame.font.Font
+
+
+
+
+    def get(self, path, size):
+        """Return the font at `path` (None for the default font) in the given size."""
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            source = bundle.file(path) if path else None
+            font = pygame.font.Font(source if source is not None else path, size)
+            self.fonts[key] = font
+        return font
+
+
+
+
+class TextCache:
+    """Least-recently-used cache of rendered text surfaces."""
+    def __init__(self, max_entries=UI.TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()  # (font, text, color, antialias) -> surface
+
+
+
+
+    def render(self, font, text, color, antialias=True, alpha=None):
+        """
+        Render text once and reuse the surface on later calls.
+        :param alpha: Optional surface alpha; cached surfaces are shared, so it is reset on every call.
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)  # Drop the least recently used text
+        else:
+            self.surfaces.move_to_end(key)
+        surface.set_alpha(255 if alpha is None else alpha)
+        return surface
+
+
+
+
+class GradientCache:
+    """Gradient surfaces built on first use and reused for as long as their size and colors don't change."""
+    def __init__(self):
+        self.surfaces = {}  # (size, start_color, end_color, direction) -> surface
+
+
+
+
+    def get(self, size, start_color, end_color, direction="vertical"):
+        """
+        Return an RGBA gradient surface.
+        :param size: (width, height) of the surface.
+        :param start_color: RGBA color of the first row (vertical) or column (horizontal).
+        :param end_color: RGBA color the gradient fades towards.
+        :param direction: "vertical" (top to bottom) or "horizontal" (left to right).
+        """
+        size = (int(size[0]), int(size[1]))
+        key = (size, tuple(start_color), tuple(end_color), direction)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.build(size, start_color, end_color, direction)
+            self.surfaces[key] = surface
+        return surface
+
+
+
+
+    @staticmethod
+    def build(size, start_color, end_color, direction):
+        """Draw the gradient one line at a time."""
+        width, height = size
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        length = height if direction == "vertical" else width
+        for i in range(length):
+            color = [int(start + (end - start) * i / length) for start, end in zip(start_color, end_color)]
+            if direction == "vertical":
+                surface.fill(color, (0, i, width, 1))
+            else:
+                surface.fill(color, (i, 0, 1, height))
+        return surface
+
+
+
+
+# Process-wide caches shared by the grid, pickups, indicators, units and HUD
+images = ImageRegistry()
+atlas = TextureAtlas()
+fonts = FontRegistry()
+text_cache = TextCache()
+gradients = GradientCache()
@@ -0,0 +1,56 @@
+"""
+Randomness - Named random streams derived from one master seed, so matches can be replayed exactly
+"""
+import os
+import random
+
+STREAMS = ("gameplay", "pickups", "cosmetics")
+
+
+
+
+class RandomService:
+    """
+    Independent random.Random streams, one per concern:
+        gameplay   combat rolls (critical hits)
+        pickups    pickup spawn timing and locations
+        cosmetics  particles and screen shake, which never affect the match
+    Every stream is derived from the master seed and its own name, so drawing from one never shifts
+    another: the same seed and the same actions always give the same match, whatever is on screen.
+    """
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+
+
+
+    def seed(self, seed=None):
+        """Restart every stream from `seed` (a fresh random seed when None)."""
+        self.master_seed = seed if seed is not None else int.from_bytes(os.urandom(8), "big")
+        self.streams = {}
+        for name in STREAMS:
+            setattr(self, name, self.stream(name))
+
+
+
+
+    def stream(self, name):
+        """The stream called `name`, created on first use."""
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = random.Random(f"{self.master_seed}/{name}")  # String seeds hash the same in every process
+            self.streams[name] = stream
+        return stream
+
+
+
+
+    def fork(self, name):
+        """A new service whose streams are independent of this one's, e.g. one per simulation worker."""
+        return RandomService(f"{self.master_seed}/{name}")
+
+
+
+
+# Shared by the game; headless engines may be given their own service
+random_service = RandomService()
@@ -0,0 +1,320 @@
+"""
+Batch simulator - Plays many headless AI matches across a process pool and aggregates the results
+
+    python simulate.py --matches 10000 --blue-policy greedy --red-policy random --checkpoint sweep.json
+
+Match i always plays the same way for a given --seed (its seed, draft and policy streams are derived
+from the master seed and i alone), so results don't depend on the number of workers, and a sweep
+interrupted after a checkpoint resumes where it stopped when run again with the same arguments.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import CHAMPIONS
+from rng import RandomService
+
+DEFAULT_MAX_TURNS = 2000  # Matches still running after this many turns count as draws
+DEFAULT_BATCH_SIZE = 25  # Matches per worker task: big enough to amortize the round trip, small enough to balance
+CHECKPOINT_VERSION = 2  # 2 added the search counters to summaries; files without a version are 1
+
+
+
+
+def draft(rng, teams):
+    """(blue names, red names) from the fixed --teams compositions, or two random pairs of distinct champions."""
+    if teams is not None:
+        return teams
+    names = rng.sample(sorted(CHAMPIONS), 4)
+    return names[:2], names[2:]
+
+
+
+
+def team_keys(engine, team):
+    """Enemy keys held by `team` (the ones that open the enemy barrier)."""
+    players = engine.units[0:2] if team == "blue" else engine.units[2:4]
+    return sum(unit.red_keys if team == "blue" else unit.blue_keys for unit in players)
+
+
+
+
+def play_match(index, settings):
+    """Play match `index` of a sweep and return its record (a JSON-friendly dict)."""
+    from ai import POLICIES, take_turn
+    from engine import Engine, create_roster
+
+    rng = RandomService(settings["seed"]).fork(f"match-{index}")
+    blue, red = draft(rng.stream("draft"), settings["teams"])
+    engine = Engine(create_roster(blue, red), rng=rng)
+    policies = {
+        "blue": POLICIES[settings["blue_policy"]](rng.stream("blue-policy")),
+        "red": POLICIES[settings["red_policy"]](rng.stream("red-policy")),
+    }
+
+    first_key = {}  # Team -> turn it first held an enemy key
+    barrier_down = {}  # Team -> turn it broke the enemy barrier
+    abilities = {}
+    ability_names = {ability.name for unit in engine.units for ability in unit.abilities}
+    stalled = False
+    while engine.winner is None and engine.current_turn <= settings["max_turns"] and not stalled:
+        events, stalled = take_turn(engine, policies[engine.current_unit().color])
+        for event in events:
+            if event[0] == "sound" and event[1] in ability_names:
+                abilities[event[1]] = abilities.get(event[1], 0) + 1
+        for team, enemy_barrier in (("blue", engine.red_barrier), ("red", engine.blue_barrier)):
+            if team not in first_key and team_keys(engine, team):
+                first_key[team] = engine.current_turn
+            if team not in barrier_down and enemy_barrier == "Down":
+                barrier_down[team] = engine.current_turn
+
+    search = {}  # Policy name -> counters of the searching policies (see AlphaBetaPolicy.search_stats)
+    for policy in policies.values():
+        if hasattr(policy, "search_stats"):
+            add_counters(search.setdefault(policy.name, {}), policy.search_stats())
+
+    return {
+        "teams": {"blue": list(blue), "red": list(red)},
+        "winner": engine.winner or "draw",
+        "turns": engine.current_turn,
+        "stalled": stalled,
+        "first_key": first_key,
+        "barrier_down": barrier_down,
+        "abilities": abilities,
+        "search": search,
+    }
+
+
+
+
+def add_counters(totals, counters):
+    """Add a dict of counters into `totals`."""
+    for name, value in counters.items():
+        totals[name] = totals.get(name, 0) + value
+
+
+
+
+def empty_summary():
+    """Aggregate of zero matches."""
+    return {
+        "matches": 0,
+        "wins": {"blue": 0, "red": 0, "draw": 0},
+        "stalled": 0,
+        "turns": 0,
+        "champions": {},  # name -> {"games", "wins"}
+        "first_key": {"blue": [0, 0], "red": [0, 0]},  # team -> [matches where it happened, sum of turns]
+        "barrier_down": {"blue": [0, 0], "red": [0, 0]},
+        "abilities": {},  # name -> uses
+        "search": {},  # policy name -> search counters
+    }
+
+
+
+
+def add_match(summary, record):
+    """Fold one match record into a summary."""
+    summary["matches"] += 1
+    summary["wins"][record["winner"]] += 1
+    summary["stalled"] += record["stalled"]
+    summary["turns"] += record["turns"]
+    for team, names in record["teams"].items():
+        for name in names:
+            champion = summary["champions"].setdefault(name, {"games": 0, "wins": 0})
+            champion["games"] += 1
+            champion["wins"] += record["winner"] == team
+    for timing in ("first_key", "barrier_down"):
+        for team, turn in record[timing].items():
+            summary[timing][team][0] += 1
+            summary[timing][team][1] += turn
+    add_counters(summary["abilities"], record["abilities"])
+    for policy, counters in record["search"].items():
+        add_counters(summary["search"].setdefault(policy, {}), counters)
+
+
+
+
+def merge(summary, other):
+    """Fold a partial summary (one batch) into `summary`."""
+    for key in ("matches", "stalled", "turns"):
+        summary[key] += other[key]
+    for team, wins in other["wins"].items():
+        summary["wins"][team] += wins
+    for name, counts in other["champions"].items():
+        champion = summary["champions"].setdefault(name, {"games": 0, "wins": 0})
+        champion["games"] += counts["games"]
+        champion["wins"] += counts["wins"]
+    for timing in ("first_key", "barrier_down"):
+        for team, (count, total) in other[timing].items():
+            summary[timing][team][0] += count
+            summary[timing][team][1] += total
+    add_counters(summary["abilities"], other["abilities"])
+    for policy, counters in other["search"].items():
+        add_counters(summary["search"].setdefault(policy, {}), counters)
+
+
+
+
+def init_worker():
+    """Leave Ctrl+C to the parent process, which saves progress."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+
+
+def run_batch(batch, settings):
+    """Play one batch of matches in a worker and return (batch, partial summary)."""
+    start = batch * settings["batch_size"]
+    summary = empty_summary()
+    for index in range(start, min(start + settings["batch_size"], settings["matches"])):
+        add_match(summary, play_match(index, settings))
+    return batch, summary
+
+
+
+
+def load_checkpoint(path, settings):
+    """(completed batches, summary) saved at `path`, or a fresh start when there is no checkpoint yet."""
+    if path is None or not os.path.exists(path):
+        return set(), empty_summary()
+    with open(path) as file:
+        saved = json.load(file)
+    if saved.get("version", 1) > CHECKPOINT_VERSION:
+        raise SystemExit(f"{path} was written by a newer version of this simulator")
+    if saved["settings"] != settings:
+        raise SystemExit(f"{path} was written by a sweep with different settings: {saved['settings']}")
+    summary = saved["summary"]
+    summary.setdefault("search", {})  # Version 1 summaries have no search counters
+    return set(saved["completed_batches"]), summary
+
+
+
+
+def save_checkpoint(path, settings, completed, summary):
+    """Write the checkpoint atomically, so an interrupted write never leaves a broken file."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump({"version": CHECKPOINT_VERSION, "settings": settings, "completed_batches": sorted(completed),
+                   "summary": summary}, file)
+    os.replace(temporary, path)
+
+
+
+
+def average(count_and_total):
+    """Mean turn of a [count, total] timing, or "-" when it never happened."""
+    count, total = count_and_total
+    return f"{total / count:.1f}" if count else "-"
+
+
+
+
+def report(summary):
+    """Print a summary as win rates, match length, key/barrier timings and ability usage."""
+    matches = summary["matches"]
+    if not matches:
+        print("No matches played.")
+        return
+    wins = summary["wins"]
+    print(f"Matches: {matches}  (stalled: {summary['stalled']})")
+    print(f"Win rate  blue {wins['blue'] / matches:.1%}  red {wins['red'] / matches:.1%}  draw {wins['draw'] / matches:.1%}")
+    print(f"Average match length: {summary['turns'] / matches:.1f} turns")
+    for team in ("blue", "red"):
+        first_key = summary["first_key"][team]
+        barrier = summary["barrier_down"][team]
+        print(f"{team:>5}: first enemy key at turn {average(first_key)} ({first_key[0] / matches:.0%} of matches), "
+              f"enemy barrier down at turn {average(barrier)} ({barrier[0] / matches:.0%} of matches)")
+    print("Champions:")
+    for name, counts in sorted(summary["champions"].items(), key=lambda item: -item[1]["wins"] / item[1]["games"]):
+        print(f"  {name:<10} {counts['wins'] / counts['games']:6.1%} win rate over {counts['games']} games")
+    for policy, counters in summary["search"].items():
+        rate = counters["nodes"] / counters["seconds"] if counters["seconds"] else 0
+        hit_rate = counters["hits"] / counters["probes"] if counters["probes"] else 0
+        print(f"Search ({policy}): {rate:.0f} nodes/s, transposition table hit rate {hit_rate:.1%}, "
+              f"average depth {counters['depth'] / counters['searches']:.1f}")
+    print("Abilities (uses per match):")
+    for name, uses in sorted(summary["abilities"].items(), key=lambda item: -item[1]):
+        print(f"  {name:<20} {uses / matches:.2f}")
+
+
+
+
+def simulate(settings, workers=None, checkpoint=None, checkpoint_every=30):
+    """Play every match of the sweep described by `settings` and return the summary."""
+    batches = -(-settings["matches"] // settings["batch_size"])
+    completed, summary = load_checkpoint(checkpoint, settings)
+    pending = [batch for batch in range(batches) if batch not in completed]
+    if completed:
+        print(f"Resuming from {checkpoint}: {len(completed)}/{batches} batches already played")
+
+    start = last_save = time.perf_counter()
+    played = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = [pool.submit(run_batch, batch, settings) for batch in pending]
+        try:
+            for future in as_completed(futures):
+                batch, partial = future.result()
+                merge(summary, partial)
+                completed.add(batch)
+                played += partial["matches"]
+                now = time.perf_counter()
+                print(f"{summary['matches']}/{settings['matches']} matches  blue {summary['wins']['blue']}  "
+                      f"red {summary['wins']['red']}  draw {summary['wins']['draw']}  "
+                      f"({played / (now - start):.1f} matches/s)", flush=True)
+                if checkpoint is not None and now - last_save >= checkpoint_every:
+                    save_checkpoint(checkpoint, settings, completed, summary)
+                    last_save = now
+        finally:
+            for future in futures:
+                future.cancel()
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, settings, completed, summary)
+    return summary
+
+
+
+
+def parse_teams(value):
+    """'Garen,Ashe:Darius,Soraka' -> (["Garen", "Ashe"], ["Darius", "Soraka"])."""
+    blue, red = (side.split(",") for side in value.split(":"))
+    names = blue + red
+    if len(blue) != 2 or len(red) != 2 or len(set(names)) != 4 or not set(names) <= set(CHAMPIONS):
+        raise argparse.ArgumentTypeError(f"expected two distinct champions per team out of {', '.join(CHAMPIONS)}")
+    return blue, red
+
+
+
+
+if __name__ == "__main__":
+    from ai import POLICIES
+
+    parser = argparse.ArgumentParser(description="Play headless AI matches in parallel and aggregate the results")
+    parser.add_argument("--matches", type=int, default=1000, help="number of matches to play")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="master seed of the sweep")
+    parser.add_argument("--blue-policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--red-policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--teams", type=parse_teams, metavar="A,B:C,D",
+                        help="fixed blue and red compositions (default: a random draft per match)")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS,
+                        help="turn limit after which a match is a draw")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="matches per worker task")
+    parser.add_argument("--checkpoint", metavar="PATH", help="save progress to PATH and resume from it")
+    parser.add_argument("--checkpoint-every", type=float, default=30, metavar="SECONDS",
+                        help="how often to save the checkpoint")
+    args = parser.parse_args()
+
+    settings = {
+        "matches": args.matches, "seed": args.seed, "blue_policy": args.blue_policy, "red_policy": args.red_policy,
+        "teams": args.teams and [list(args.teams[0]), list(args.teams[1])], "max_turns": args.max_turns,
+        "batch_size": args.batch_size,
+    }
+    try:
+        summary = simulate(settings, args.workers, args.checkpoint, args.checkpoint_every)
+    except KeyboardInterrupt:
+        print("Interrupted" + (f": progress saved to {args.checkpoint}" if args.checkpoint else ""))
+        sys.exit(1)
+    report(summary)
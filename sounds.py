@@ -1,71 +1,224 @@
 import pygame
+import threading
+from constants import Assets
+from bundle import bundle
+
+MENU_SOUNDS = ("selection",)  # Needed by the menus right away, decoded before the first frame
+
+SOUND_FILES = {  # Sound name -> file
+    "menu_music":"sounds/menu_music.mp3",
+    #ashe
+    "Arrow Shot": "sounds/ashe_arrow.mp3",
+    "Frost Arrow": "sounds/ashe_arrowattack.mp3",
+    "Ashe Basic Attack":"sounds/ashe_attack.ogg",
+    "Healing Wind":"sounds/blood.mp3",
+    #garen
+    "Charge":"sounds/charge.mp3",
+    "Slash":"sounds/sword.wav",
+    "Fortify":"sounds/justice_garen.mp3",
+    "Garen Basic Attack":"sounds/garen_ha.mp3",
+
+    #darius
+    "Darius Basic Attack":"sounds/darius_attack.ogg",
+    "Decimate ":"sounds/darius_attack2.ogg",
+    "Crippling Strike":"sounds/darius_laugh.ogg",
+    "darius_death":"sounds/darius_death.ogg",
+    "Noxian Guillotine":"sounds/Darius_Original_R_1.ogg",
+    
+    "potion":"sounds/potion_sound.mp3",
+    #rengar
+    "rengar_attack":"sounds/rengar_attack.ogg",
+    "rengar_attack2":"sounds/rengar_attack2.ogg",
+    "Rengar Come ON":"sounds/rengar_comeon.ogg",
+    "Thrill of the Hunt":"sounds/rengar_hunt.ogg",
+    "Rengar Basic Attack":"sounds/rengar_roar.ogg",
+    "Battle Roar":"sounds/rengar_roarbattle.ogg",
+    "Savagery":"sounds/rengar_savagery.ogg",
+
+    "bomb":"sounds/smite-101soundboards.mp3",
+    #soraka
+    "Soraka Basic Attack":"sounds/soraka_attack.ogg",
+    "soraka_death":"sounds/soraka_death.ogg",
+    "Starcall":"sounds/soraka_starcall.ogg",
+    "Wish":"sounds/soraka_wish.ogg",
+    "Astral Infusion":"sounds/soraka_astral.ogg",
+    
+    "selection":"sounds/selection.mp3",
+    "game_music": "sounds/game_music.mp3",
+
+
+}
+
+
+
+
+class SoundBank:
+    """
+    Process-wide cache of decoded sounds.
+    Each file is decoded at most once; every caller gets the same pygame.mixer.Sound handle.
+    """
+    def __init__(self):
+        self.sounds = {}  # path -> pygame.mixer.Sound
+        self.pending = {}  # path -> threading.Event, set once its background decode is over
+        self.failed = {}  # path -> error raised while decoding it in the background
+        self.lock = threading.Lock()
+
+
+
+
+    def get(self, path):
+        """Return the decoded sound for `path`, decoding it on first use."""
+        sound = self.sounds.get(path)
+        if sound is not None:
+            return sound
+        with self.lock:
+            sound = self.sounds.get(path)
+            done = self.pending.get(path)
+            if sound is None and done is None:
+                # Claim the file, so a preload() queued meanwhile leaves it to this call
+                self.pending[path] = threading.Event()
+        if sound is not None:
+            return sound
+        if done is not None:
+            done.wait()  # Already being decoded elsewhere: wait rather than decode it twice
+            sound = self.sounds.get(path)
+            if sound is not None:
+                return sound
+            return self.decode(path)  # The other decode failed: this one raises its error to the caller
+        try:
+            return self.decode(path)
+        finally:
+            with self.lock:
+                self.pending.pop(path).set()
+
+
+
+
+    def decode(self, path):
+        """Decode a sound file and keep the handle."""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        sound = bundle.sound(path)  # PCM straight from the bundle, when available
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+        self.sounds[path] = sound
+        return sound
+
+
+
+
+    def preload(self, paths):
+        """
+        Decode sound files on a background thread, in the given order.
+        :return: The worker thread, or None if every file was already loaded or queued.
+        """
+        with self.lock:
+            queued = [path for path in dict.fromkeys(paths) if path not in self.sounds and path not in self.pending]
+            for path in queued:
+                self.pending[path] = threading.Event()
+        if not queued:
+            return None
+        worker = threading.Thread(target=self.decode_in_background, args=(queued,), name="sound-preload", daemon=True)
+        worker.start()
+        return worker
+
+
+
+
+    def decode_in_background(self, paths):
+        """Worker loop for preload(): a missing or broken file is reported and skipped."""
+        for path in paths:
+            try:
+                if path not in self.sounds:
+                    self.decode(path)
+            except (pygame.error, FileNotFoundError) as error:
+                self.failed[path] = error
+                print(f"Could not load sound {path}: {error}")
+            finally:
+                with self.lock:
+                    self.pending.pop(path).set()
+
+
+
+
+    def ready(self, path):
+        """True once `path` is decoded and can play without a decoding stall."""
+        return path in self.sounds
+
+
+
+
+    def loaded(self, path):
+        """Return the sound for `path` if it has been decoded, else None."""
+        return self.sounds.get(path)
+
+
+
+
+# Shared by the game, the units and every Sounds instance
+sound_bank = SoundBank()
+
+
+
 
 class Sounds:
     def __init__(self):
         """
         Initialise le gestionnaire de sons et prépare le dictionnaire de sons.
+        Only the menu sounds are decoded here; the rest is decoded by preload() on a background
+        thread (or on first play, whichever comes first) through the shared sound bank.
         """
         pygame.mixer.init()
-        self.sounds = {
-            "menu_music":pygame.mixer.Sound("sounds/menu_music.mp3"),
-            #ashe
-            "Arrow Shot": pygame.mixer.Sound("sounds/ashe_arrow.mp3"),
-            "Frost Arrow": pygame.mixer.Sound("sounds/ashe_arrowattack.mp3"),
-            "Ashe Basic Attack":pygame.mixer.Sound("sounds/ashe_attack.ogg"),
-            "Healing Wind":pygame.mixer.Sound("sounds/blood.mp3"),
-            #garen
-            "Charge":pygame.mixer.Sound("sounds/charge.mp3"),
-            "Slash":pygame.mixer.Sound("sounds/sword.wav"),
-            "Fortify":pygame.mixer.Sound("sounds/justice_garen.mp3"),
-            "Garen Basic Attack":pygame.mixer.Sound("sounds/garen_ha.mp3"),
-
-            #darius
-            "Darius Basic Attack":pygame.mixer.Sound("sounds/darius_attack.ogg"),
-            "Decimate ":pygame.mixer.Sound("sounds/darius_attack2.ogg"),
-            "Crippling Strike":pygame.mixer.Sound("sounds/darius_laugh.ogg"),
-            "darius_death":pygame.mixer.Sound("sounds/darius_death.ogg"),
-            "Noxian Guillotine":pygame.mixer.Sound("sounds/Darius_Original_R_1.ogg"),
-            
-            "potion":pygame.mixer.Sound("sounds/potion_sound.mp3"),
-            #rengar
-            "rengar_attack":pygame.mixer.Sound("sounds/rengar_attack.ogg"),
-            "rengar_attack2":pygame.mixer.Sound("sounds/rengar_attack2.ogg"),
-            "Rengar Come ON":pygame.mixer.Sound("sounds/rengar_comeon.ogg"),
-            "Thrill of the Hunt":pygame.mixer.Sound("sounds/rengar_hunt.ogg"),
-            "Rengar Basic Attack":pygame.mixer.Sound("sounds/rengar_roar.ogg"),
-            "Battle Roar":pygame.mixer.Sound("sounds/rengar_roarbattle.ogg"),
-            "Savagery":pygame.mixer.Sound("sounds/rengar_savagery.ogg"),
-
-            "bomb":pygame.mixer.Sound("sounds/smite-101soundboards.mp3"),
-            #soraka
-            "Soraka Basic Attack":pygame.mixer.Sound("sounds/soraka_attack.ogg"),
-            "soraka_death":pygame.mixer.Sound("sounds/soraka_death.ogg"),
-            "Starcall":pygame.mixer.Sound("sounds/soraka_starcall.ogg"),
-            "Wish":pygame.mixer.Sound("sounds/soraka_wish.ogg"),
-            "Astral Infusion":pygame.mixer.Sound("sounds/soraka_astral.ogg"),
-            
-            "selection":pygame.mixer.Sound("sounds/selection.mp3"),
-            "game_music": pygame.mixer.Sound("sounds/game_music.mp3"),
-
-
-        }
+        self.files = dict(SOUND_FILES)
+
+        for name in MENU_SOUNDS:
+            self.get(name)
+
+
+
+
+    def preload(self):
+        """
+        Start decoding every other sound on a background thread.
+        Called once the first menu frame is up, so decoding doesn't delay it.
+        """
+        # Music first so the main menu can start it as soon as possible, then effects and footsteps
+        background = [self.files["game_music"]] + list(self.files.values()) + [Assets.MOVING, Assets.WATER_SOUND]
+        return sound_bank.preload(background)
+
+
+
+
+    def ready(self, name):
+        """True once the named sound is decoded; lets callers start it without blocking a frame."""
+        return name in self.files and sound_bank.ready(self.files[name])
+
+
+
+
+    def get(self, name):
+        """Shared handle for a named sound (decoded on first use)."""
+        return sound_bank.get(self.files[name])
+
+
 
 
     def play(self, name, loop=0):
-        if name in self.sounds:
-            self.sounds[name].play(loops=loop)  # Utilise l'option `loops` de pygame
+        if name in self.files:
+            self.get(name).play(loops=loop)  # Utilise l'option `loops` de pygame
 
 
 
 
     def set_volume(self, sound_name, volume):
-        if sound_name in self.sounds:
-            self.sounds[sound_name].set_volume(volume)
+        if sound_name in self.files:
+            self.get(sound_name).set_volume(volume)
     
 
 
     
     def stop(self, sound_name):
-        if sound_name in self.sounds:
-            self.sounds[sound_name].stop()
-    
+        if sound_name in self.files:
+            sound = sound_bank.loaded(self.files[sound_name])
+            if sound is not None:  # Nothing to stop if it was never decoded
+                sound.stop()
@@ -0,0 +1,119 @@
+"""
+Spatial index - Which living units stand on each tile, kept up to date as units move, die and respawn
+"""
+
+DISC_OFFSETS = {}  # radius -> (dx, dy) offsets of the Manhattan disc of that radius
+
+
+
+
+def disc_offsets(radius):
+    """Offsets (dx, dy) with |dx| + |dy| <= radius, row by row; computed once per radius."""
+    offsets = DISC_OFFSETS.get(radius)
+    if offsets is None:
+        offsets = tuple((dx, dy)
+                        for dx in range(-radius, radius + 1)
+                        for dy in range(abs(dx) - radius, radius - abs(dx) + 1))
+        DISC_OFFSETS[radius] = offsets
+    return offsets
+
+
+
+
+class OccupancyIndex:
+    """
+    Maps (x, y) to the living units on that tile.
+    Tracked units report their own position and life changes (see Unit.x / Unit.y / Unit.alive), so
+    "who is on this tile" costs O(1) and radius queries O(area) instead of a scan over every unit.
+    Units on one tile are kept in roster order, so results match a scan of the roster.
+    """
+    def __init__(self):
+        self.cells = {}  # (x, y) -> living units on the tile, in roster order
+        self.rank = {}  # unit -> position in the roster
+
+
+
+
+    def track(self, units):
+        """Start indexing `units` (the match roster, in turn order)."""
+        for unit in units:
+            self.rank[unit] = len(self.rank)
+            unit.occupancy = self
+            if unit.alive:
+                self.insert(unit, (unit.x, unit.y))
+
+
+
+
+    def insert(self, unit, tile):
+        """Add a unit to a tile, keeping the tile's units in roster order."""
+        units = self.cells.setdefault(tile, [])
+        rank = self.rank[unit]
+        index = len(units)
+        while index > 0 and self.rank[units[index - 1]] > rank:
+            index -= 1
+        units.insert(index, unit)
+
+
+
+
+    def remove(self, unit, tile):
+        """Take a unit off a tile."""
+        units = self.cells.get(tile)
+        if units is not None and unit in units:
+            units.remove(unit)
+            if not units:
+                del self.cells[tile]
+
+
+
+
+    def moved(self, unit, old_tile, new_tile):
+        """A tracked unit changed position."""
+        if unit.alive and old_tile != new_tile:
+            self.remove(unit, old_tile)
+            self.insert(unit, new_tile)
+
+
+
+
+    def life_changed(self, unit, alive):
+        """A tracked unit died or came back."""
+        if alive:
+            self.insert(unit, (unit.x, unit.y))
+        else:
+            self.remove(unit, (unit.x, unit.y))
+
+
+
+
+    def at(self, x, y):
+        """Living units on (x, y), in roster order."""
+        return self.cells.get((x, y), ())
+
+
+
+
+    def first_at(self, x, y, exclude=None, exclude_color=None):
+        """First living unit on (x, y) other than `exclude` and not of team `exclude_color`; None if there is none."""
+        for unit in self.cells.get((x, y), ()):
+            if unit is not exclude and (exclude_color is None or unit.color != exclude_color):
+                return unit
+        return None
+
+
+
+
+    def within(self, x, y, radius):
+        """Living units within Manhattan distance `radius` of (x, y), in roster order."""
+        found = []
+        if (radius + 1) * (radius + 1) * 2 > len(self.cells):
+            # Fewer occupied tiles than tiles in the diamond: check each occupied tile instead
+            for (cx, cy), units in self.cells.items():
+                if abs(cx - x) + abs(cy - y) <= radius:
+                    found.extend(units)
+        else:
+            for dx, dy in disc_offsets(radius):
+                found.extend(self.cells.get((x + dx, y + dy), ()))
+        found.sort(key=self.rank.__getitem__)
+        return found
@@ -0,0 +1,221 @@
+"""
+Match state - Compact snapshot of everything the rules depend on, cheap to clone and to serialize
+
+A MatchState keeps every unit's gameplay fields in one flat array of ints (one row of UNIT_FIELDS per
+unit), so cloning is a couple of array copies whatever the number of fields. Display-only data (images,
+bar animations, damage numbers: see unit.UnitView) is never part of it.
+"""
+import sys
+import struct
+from array import array
+from operator import attrgetter
+from config import PICKUP_TYPES
+
+# Per-unit gameplay fields, in storage order (this order also fixes the binary layout).
+# Plain int fields come first so a unit's row is read in one attrgetter call; the rest are encoded.
+NUMERIC_FIELDS = (
+    "x", "y", "initial_x", "initial_y", "target_x", "target_y",
+    "health", "max_health", "mana", "max_mana", "damage", "physical_defense", "magical_defense", "crit_chance",
+    "move_range", "attack_range",
+    "buffed_damage_increase", "buffed_defense_increase", "debuffed_attack_reduction", "debuffed_defense_reduction",
+    "buff_duration", "debuff_duration", "red_keys", "blue_keys", "death_timer",
+)
+UNIT_FIELDS = NUMERIC_FIELDS + ("alive", "is_buffed", "is_debuffed", "state", "selected_ability", "color", "barrier_status")
+FIELD_INDEX = {name: index for index, name in enumerate(UNIT_FIELDS)}
+STRIDE = len(UNIT_FIELDS)
+
+# Enumerated string fields are stored as their index in these tuples
+STATES = ("move", "attack", "done")
+COLORS = (None, "blue", "red", "neutral")
+BARRIERS = (None, "Up", "Down")
+PICKUP_NAMES = tuple(PICKUP_TYPES)
+
+MAGIC = b"LOBS"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHHHiBBBBiBH")  # magic, version, counts, then the match scalars
+read_numeric = attrgetter(*NUMERIC_FIELDS)
+NUMERIC_COUNT = len(NUMERIC_FIELDS)
+
+
+
+
+class MatchState:
+    """Snapshot of a match. Only the two arrays are mutable; everything else is shared between clones."""
+    __slots__ = ("units", "cooldowns", "ability_counts", "current_unit_index", "current_turn",
+                 "red_barrier", "blue_barrier", "keys_initialized", "winner",
+                 "pickup_turn", "next_spawn_turns", "pickups")
+
+    def __init__(self, units, cooldowns, ability_counts, current_unit_index, current_turn, red_barrier, blue_barrier,
+                 keys_initialized, winner, pickup_turn, next_spawn_turns, pickups):
+        self.units = units  # array("i"): STRIDE ints per unit, in roster order
+        self.cooldowns = cooldowns  # array("i"): remaining cooldown of every ability, unit after unit
+        self.ability_counts = ability_counts  # Tuple: number of abilities of each unit
+        self.current_unit_index = current_unit_index
+        self.current_turn = current_turn
+        self.red_barrier = red_barrier
+        self.blue_barrier = blue_barrier
+        self.keys_initialized = keys_initialized
+        self.winner = winner
+        self.pickup_turn = pickup_turn
+        self.next_spawn_turns = next_spawn_turns  # Tuple of (pickup type, turn)
+        self.pickups = pickups  # Tuple of (x, y, pickup type, spawn turn)
+
+
+
+
+    def clone(self):
+        """Independent copy, in O(units)."""
+        return MatchState(self.units[:], self.cooldowns[:], self.ability_counts, self.current_unit_index,
+                          self.current_turn, self.red_barrier, self.blue_barrier, self.keys_initialized, self.winner,
+                          self.pickup_turn, self.next_spawn_turns, self.pickups)
+
+
+
+
+    def get(self, unit_index, field):
+        """One unit field, as stored (enumerated fields are indexes, see STATES / COLORS / BARRIERS)."""
+        return self.units[unit_index * STRIDE + FIELD_INDEX[field]]
+
+
+
+
+    def set(self, unit_index, field, value):
+        """Overwrite one stored unit field."""
+        self.units[unit_index * STRIDE + FIELD_INDEX[field]] = value
+
+
+
+
+    def __eq__(self, other):
+        return isinstance(other, MatchState) and self.encode() == other.encode()
+
+    __hash__ = None
+
+
+
+
+    def encode(self):
+        """Stable little-endian binary form (the same state always gives the same bytes)."""
+        header = HEADER.pack(
+            MAGIC, VERSION, len(self.ability_counts), STRIDE, len(self.cooldowns), self.current_unit_index,
+            self.current_turn, BARRIERS.index(self.red_barrier), BARRIERS.index(self.blue_barrier),
+            int(self.keys_initialized), COLORS.index(self.winner), self.pickup_turn,
+            len(self.next_spawn_turns), len(self.pickups),
+        )
+        units, cooldowns = self.units, self.cooldowns
+        if sys.byteorder == "big":
+            units, cooldowns = units[:], cooldowns[:]
+            units.byteswap()
+            cooldowns.byteswap()
+        parts = [header, bytes(self.ability_counts), units.tobytes(), cooldowns.tobytes()]
+        parts += [struct.pack("<Bi", PICKUP_NAMES.index(name), turn) for name, turn in self.next_spawn_turns]
+        parts += [struct.pack("<BBBi", x, y, PICKUP_NAMES.index(name), turn) for x, y, name, turn in self.pickups]
+        return b"".join(parts)
+
+
+
+
+    @classmethod
+    def decode(cls, data):
+        """Rebuild a state from encode()'s bytes."""
+        (magic, version, unit_count, stride, cooldown_count, current_unit_index, current_turn, red_barrier,
+         blue_barrier, keys_initialized, winner, pickup_turn, spawn_count, pickup_count) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or stride != STRIDE:
+            raise ValueError("Not a match state of this version")
+
+        offset = HEADER.size
+        ability_counts = tuple(data[offset:offset + unit_count])
+        offset += unit_count
+        units = array("i", data[offset:offset + 4 * unit_count * STRIDE])
+        offset += 4 * unit_count * STRIDE
+        cooldowns = array("i", data[offset:offset + 4 * cooldown_count])
+        offset += 4 * cooldown_count
+        if sys.byteorder == "big":
+            units.byteswap()
+            cooldowns.byteswap()
+
+        next_spawn_turns = []
+        for _ in range(spawn_count):
+            name, turn = struct.unpack_from("<Bi", data, offset)
+            next_spawn_turns.append((PICKUP_NAMES[name], turn))
+            offset += 5
+        pickups = []
+        for _ in range(pickup_count):
+            x, y, name, turn = struct.unpack_from("<BBBi", data, offset)
+            pickups.append((x, y, PICKUP_NAMES[name], turn))
+            offset += 7
+
+        return cls(units, cooldowns, ability_counts, current_unit_index, current_turn, BARRIERS[red_barrier],
+                   BARRIERS[blue_barrier], bool(keys_initialized), COLORS[winner], pickup_turn,
+                   tuple(next_spawn_turns), tuple(pickups))
+
+
+
+
+def capture(engine):
+    """Snapshot the rules-relevant state of an Engine."""
+    units = array("i")
+    cooldowns = array("i")
+    for unit in engine.units:
+        units.extend(read_numeric(unit))
+        ability = unit.selected_ability
+        units.extend((
+            unit.alive, unit.is_buffed, unit.is_debuffed, STATES.index(unit.state),
+            unit.abilities.index(ability) if ability is not None else -1,
+            COLORS.index(unit.color), BARRIERS.index(getattr(unit, "barrier_status", None)),
+        ))
+        cooldowns.extend(ability.remaining_cooldown for ability in unit.abilities)
+
+    pickup = engine.pickup
+    return MatchState(
+        units, cooldowns, tuple(len(unit.abilities) for unit in engine.units),
+        engine.current_unit_index, engine.current_turn, engine.red_barrier, engine.blue_barrier,
+        engine.keys_initialized, engine.winner, pickup.turn_count, tuple(pickup.next_spawn_turns.items()),
+        tuple((p.x, p.y, p.overlay, p.spawn_turn) for p in pickup.all_pickups),
+    )
+
+
+
+
+def restore(engine, state):
+    """
+    Put an Engine back into `state`. The engine must run the roster the state was captured from
+    (same units in the same order); its grid barriers, pickups and occupancy index follow the state.
+    """
+    if state.ability_counts != tuple(len(unit.abilities) for unit in engine.units):
+        raise ValueError("State was captured from a different roster")
+
+    units = state.units
+    cooldown = 0
+    for row, unit in enumerate(engine.units):
+        base = row * STRIDE
+        for name, value in zip(NUMERIC_FIELDS, units[base:base + NUMERIC_COUNT]):
+            setattr(unit, name, value)
+        alive, is_buffed, is_debuffed, unit_state, selected, color, barrier_status = units[base + NUMERIC_COUNT:base + STRIDE]
+        unit.alive = bool(alive)
+        unit.is_buffed = bool(is_buffed)
+        unit.is_debuffed = bool(is_debuffed)
+        unit.state = STATES[unit_state]
+        unit.selected_ability = unit.abilities[selected] if selected >= 0 else None
+        unit.color = COLORS[color]
+        if BARRIERS[barrier_status] is not None:
+            unit.barrier_status = BARRIERS[barrier_status]
+        for ability in unit.abilities:
+            ability.remaining_cooldown = state.cooldowns[cooldown]
+            cooldown += 1
+    engine.current_unit_index = state.current_unit_index
+    engine.current_turn = state.current_turn
+    engine.red_barrier = state.red_barrier
+    engine.blue_barrier = state.blue_barrier
+    engine.keys_initialized = state.keys_initialized
+    engine.winner = state.winner
+    engine.set_barrier_on_grid("red", state.red_barrier != "Down")
+    engine.set_barrier_on_grid("blue", state.blue_barrier != "Down")
+
+    pickup = engine.pickup
+    pickup.turn_count = state.pickup_turn
+    pickup.next_spawn_turns = dict(state.next_spawn_turns)
+    pickup.all_pickups = []
+    pickup.by_tile = {}
+    for x, y, name, spawn_turn in state.pickups:
+        pickup.spawn_single_pickup(x, y, name, spawn_turn)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+import combat
+from engine import create_roster
+from rng import RandomService
+
+
+@pytest.fixture(params=["loop", "numpy"])
+def branch(request, monkeypatch):
+    """Run the test once through the pure Python loop and once through the NumPy arrays."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(combat, "NUMPY_MIN_HITS", 1)
+    else:
+        monkeypatch.setattr(combat, "numpy", None)
+    return request.param
+
+
+def random_roster(seed):
+    """A roster with seeded health, defenses, crit chances, positions and barriers, and its own RandomService."""
+    rng = random.Random(seed)
+    service = RandomService(seed)
+    units = create_roster(["Garen", "Ashe"], ["Darius", "Soraka"])
+    for unit in units:
+        unit.rng = service
+        unit.health = rng.randint(1, unit.max_health)
+        unit.physical_defense = rng.randint(-30, 80)
+        unit.magical_defense = rng.randint(-30, 80)
+        unit.crit_chance = rng.randint(0, 100)
+        unit.x, unit.y = rng.randint(0, 20), rng.randint(0, 20)
+        if unit.unit_type == "base":
+            unit.barrier_status = rng.choice(["Up", "Down"])
+    return rng, service, units
+
+
+def random_hits(rng, attacker, targets):
+    return [(attacker, target, rng.choice([rng.randint(-50, 300), rng.randint(200, 900), 0]),
+             rng.choice(["physical", "magical"])) for target in targets]
+
+
+def test_resolve_matches_attack(branch):
+    seen = {"crit": 0, "shield": 0, "heal": 0, "death": 0}
+    for seed in range(300):
+        rng, service, units = random_roster(seed)
+        attacker = units[rng.randrange(4)]
+        # Monsters strike back, drawing extra rolls; strike() handles that, resolve() alone does not
+        targets = [unit for unit in units if unit is not attacker and unit.unit_type != "monster"]
+        hits = random_hits(rng, attacker, rng.sample(targets, rng.randint(1, len(targets))))
+        rolls = combat.roll_crits(RandomService(seed).gameplay, len(hits))
+        shielded = [target.unit_type == "base" and target.barrier_status == "Up" for _, target, _, _ in hits]
+        dealt, after, dead = combat.resolve(
+            [raw for _, _, raw, _ in hits],
+            [attacker.crit_chance] * len(hits),
+            [target.physical_defense if damage_type == "physical" else target.magical_defense
+             for _, target, _, damage_type in hits],
+            [target.health for _, target, _, _ in hits],
+            shielded,
+            rolls,
+        )
+        expected = [attacker.attack(target, raw, damage_type) for _, target, raw, damage_type in hits]
+
+        assert [int(damage) for damage in dealt] == expected
+        assert [int(health) for health in after] == [target.health for _, target, _, _ in hits]
+        assert [bool(killed) for killed in dead] == [not target.alive for _, target, _, _ in hits]
+        for (_, _, raw, _), roll, shield, killed in zip(hits, rolls, shielded, dead):
+            seen["crit"] += raw > 0 and roll <= attacker.crit_chance and not shield
+            seen["shield"] += shield and raw > 0
+            seen["heal"] += raw < 0
+            seen["death"] += bool(killed)
+    assert all(seen.values()), seen
+
+
+def test_strike_matches_attack(branch):
+    for seed in range(300):
+        outcomes = []
+        for apply in ("attack", "strike"):
+            rng, service, units = random_roster(seed)
+            attacker = units[rng.randrange(4)]
+            targets = rng.sample([unit for unit in units if unit is not attacker], rng.randint(1, 8))
+            hits = random_hits(rng, attacker, targets)
+            if apply == "attack":
+                dealt = [hitter.attack(target, raw, damage_type) for hitter, target, raw, damage_type in hits]
+            else:
+                dealt = combat.strike(hits)
+            # The next roll shows both drew the same number of rolls, monster counter-attacks included
+            outcomes.append((dealt, [(unit.health, unit.alive) for unit in units], service.gameplay.random()))
+        assert outcomes[0] == outcomes[1]
@@ -0,0 +1,34 @@
+from ai import GreedyPolicy, take_turn
+from engine import Engine, create_roster
+from rng import RandomService
+
+
+def test_headless_match_prints_nothing(capsys):
+    """Gameplay messages of the engine, units and abilities come back as "console" events, not on stdout."""
+    engine = Engine(create_roster(["Garen", "Ashe"], ["Darius", "Soraka"]), rng=RandomService(4))
+    policy = GreedyPolicy(RandomService(4).stream("policy"))
+    messages = [message for kind, message in engine.take_events() if kind == "console"]
+    while engine.winner is None and engine.current_turn <= 200:
+        events, _ = take_turn(engine, policy)
+        messages += [event[1] for event in events if event[0] == "console"]
+
+    assert capsys.readouterr().out == ""
+    assert "Initial keys have been assigned to players." in messages
+    assert any(message.endswith(" attacks Darius!") for message in messages)  # Unit.attack
+    assert any(" takes " in message for message in messages)  # Abilities
+
+
+def test_boxed_in_unit_passes():
+    """A unit with nowhere free to end its move passes its turn instead of stalling the match."""
+    engine = Engine(create_roster(["Garen", "Ashe"], ["Darius", "Soraka"]), rng=RandomService(4))
+    unit = engine.current_unit()
+    other = next(other for other in engine.units if other is not unit)
+    other.x, other.y = unit.x, unit.y
+    unit.move_range = 0
+    assert engine.stuck(unit)
+    engine.apply_action(("confirm_move",))
+    assert unit.state == "move"
+
+    turn = engine.current_turn
+    _, stalled = take_turn(engine, GreedyPolicy(RandomService(4).stream("policy")))
+    assert not stalled and engine.current_turn == turn + 1
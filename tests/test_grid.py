@@ -0,0 +1,98 @@
+import pytest
+
+from constants import GRID_SIZE
+from engine import Engine, create_roster
+from interface import Grid, Tile
+
+RANGES = range(0, 8)
+
+
+def old_bfs(grid, x, y, move_range):
+    """The breadth-first search the move highlight used before reachable_tiles (first visit wins, whatever its cost)."""
+    reachable = set()
+    visited = set()
+    queue = [(x, y, 0)]
+    while queue:
+        x, y, cost = queue.pop(0)
+        if (x, y) in visited or cost > move_range:
+            continue
+        visited.add((x, y))
+        if grid.tiles[x][y].traversable:
+            reachable.add((x, y))
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
+                    next_cost = cost + grid.tiles[nx][ny].move_cost
+                    if next_cost <= move_range and (nx, ny) not in visited:
+                        queue.append((nx, ny, next_cost))
+    return reachable
+
+
+def cheapest(grid, x, y, move_range):
+    """Cells whose cheapest path from (x, y) costs at most move_range, relaxing every cell until nothing changes."""
+    if not grid.tiles[x][y].traversable:
+        return set()
+    costs = {(x, y): 0}
+    changed = True
+    while changed:
+        changed = False
+        for (cx, cy), cost in list(costs.items()):
+            for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and grid.tiles[nx][ny].traversable:
+                    next_cost = cost + grid.tiles[nx][ny].move_cost
+                    if next_cost <= move_range and next_cost < costs.get((nx, ny), next_cost + 1):
+                        costs[(nx, ny)] = next_cost
+                        changed = True
+    return set(costs)
+
+
+@pytest.fixture
+def grid():
+    grid = Grid(GRID_SIZE, {})
+    terrains = {tile.terrain for column in grid.tiles for tile in column}
+    overlays = {tile.overlay for column in grid.tiles for tile in column}
+    assert {"grass", "water", "rock"} <= terrains and "barrier" in overlays
+    return grid
+
+
+def test_reachable_tiles_against_old_bfs(grid):
+    differences = 0
+    for x in range(GRID_SIZE):
+        for y in range(GRID_SIZE):
+            for move_range in RANGES:
+                reachable = grid.reachable_tiles(x, y, move_range)
+                bfs = old_bfs(grid, x, y, move_range)
+                assert reachable == cheapest(grid, x, y, move_range)
+                # The BFS could settle a cell through a costlier path with fewer steps and miss what lies past
+                # it; the cells it found are always reachable
+                assert bfs <= reachable
+                differences += bfs != reachable
+    assert differences  # Water makes such cases happen on this map
+
+
+def test_reachable_tiles_cache(grid):
+    engine = Engine(create_roster(["Garen", "Ashe"], ["Darius", "Soraka"]), grid=grid)
+    origin = (17, 5)  # Next to the red barrier
+    reachable = grid.reachable_tiles(*origin, 4)
+    assert grid.reachable_tiles(*origin, 4) is reachable
+    assert grid.reachable_tiles(*origin, 3) is not reachable
+
+    version = grid.version
+    engine.set_barrier_on_grid("red", up=False)
+    assert grid.version > version and not grid.reachable_cache
+    recomputed = grid.reachable_tiles(*origin, 4)
+    assert recomputed is not reachable and recomputed == cheapest(grid, *origin, 4)
+
+    engine.set_barrier_on_grid("red", up=False)  # Already down: nothing changes, so the cache stays
+    assert grid.reachable_tiles(*origin, 4) is recomputed
+
+    engine.set_barrier_on_grid("red", up=True)
+    assert grid.reachable_tiles(*origin, 4) is not recomputed
+
+    # A terrain change goes through the same invalidation, and the result follows it
+    x, y = 17, 4
+    assert (x, y) in grid.reachable_tiles(*origin, 4)
+    grid.tiles[x][y] = Tile(x, y, "rock", {})
+    grid.invalidate([(x, y)])
+    assert (x, y) not in grid.reachable_tiles(*origin, 4)
+    assert grid.reachable_tiles(*origin, 4) == cheapest(grid, *origin, 4)
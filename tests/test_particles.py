@@ -0,0 +1,64 @@
+import pygame
+import pytest
+
+import particles
+from constants import CELL_SIZE, Gameplay
+from rng import RandomService
+
+
+@pytest.fixture(params=["loop", "numpy"])
+def pool(request, monkeypatch):
+    """A seeded pool running on the pure Python loop, then on NumPy arrays."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(particles, "numpy", None)
+    pool = particles.ParticleSystem(capacity=300)
+    pool.rng = RandomService(11)
+    return pool
+
+
+def contents(pool):
+    n = pool.count
+    return [(x, y, vx, vy, life, size, pool.colors[color]) for x, y, vx, vy, life, size, color in
+            zip(pool.x[:n], pool.y[:n], pool.vx[:n], pool.vy[:n], pool.life[:n], pool.size[:n], pool.color[:n])]
+
+
+def test_update(pool):
+    for burst in range(12):
+        pool.spawn(burst, burst % 5, (255, 0, 0) if burst % 2 else (0, 0, 255, 255), count=30)
+        if burst == 5:
+            for _ in range(25):  # Let the first bursts start dying
+                pool.update()
+    assert len(pool) == pool.capacity  # Bursts beyond capacity were dropped
+    expected = contents(pool)
+    for frame in range(Gameplay.PARTICLE_MAX_LIFE + 1):
+        pool.update()
+        survivors = []
+        for x, y, vx, vy, life, size, color in expected:
+            if life > 1:
+                survivors.append((x + vx, y + vy, vx, vy + Gameplay.PARTICLE_GRAVITY, life - 1, size, color))
+        expected = survivors
+        assert contents(pool) == pytest.approx(expected)  # Dead particles are gone and the rest kept in order
+        assert len(pool) == len(expected)
+    assert not pool and pool.bounds() is None
+
+
+def test_layer_matches_sprites(monkeypatch):
+    pytest.importorskip("numpy")
+    pool = particles.ParticleSystem()
+    pool.rng = RandomService(12)
+    for x in range(0, 20, 3):
+        for y in range(0, 20, 4):
+            pool.spawn(x, y, (200, 120 + x, 40 + y), count=1)  # One particle per tile: none overlap
+    for _ in range(6):
+        pool.update()
+    size = (20 * CELL_SIZE, 20 * CELL_SIZE)
+    background, layered, blitted = pygame.Surface(size), pygame.Surface(size), pygame.Surface(size)
+    for surface in (background, layered, blitted):
+        surface.fill((30, 60, 90))
+    pool.draw(layered)
+    monkeypatch.setattr(particles, "numpy", None)
+    pool.draw(blitted)
+    assert pygame.image.tobytes(layered, "RGB") == pygame.image.tobytes(blitted, "RGB")
+    assert pygame.image.tobytes(layered, "RGB") != pygame.image.tobytes(background, "RGB")
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+import simulate
+
+SETTINGS = {"matches": 4, "seed": 7, "blue_policy": "greedy", "red_policy": "random", "teams": None,
+            "max_turns": 200, "batch_size": 1}
+
+
+def test_resumes_version_1_checkpoint(tmp_path, capsys):
+    """Checkpoints written before summaries had search counters still resume and report."""
+    path = tmp_path / "sweep.json"
+    _, first = simulate.run_batch(0, SETTINGS)
+    del first["search"]
+    path.write_text(json.dumps({"settings": SETTINGS, "completed_batches": [0], "summary": first}))
+
+    summary = simulate.simulate(SETTINGS, workers=1, checkpoint=str(path))
+    simulate.report(summary)
+    assert summary["matches"] == SETTINGS["matches"]
+    assert "Resuming" in capsys.readouterr().out
+    assert json.loads(path.read_text())["version"] == simulate.CHECKPOINT_VERSION
+
+
+def test_summary_does_not_depend_on_workers():
+    serial = simulate.empty_summary()
+    for index in range(SETTINGS["matches"]):
+        simulate.add_match(serial, simulate.play_match(index, SETTINGS))
+    assert simulate.simulate(SETTINGS, workers=1) == serial
+    assert simulate.simulate(SETTINGS, workers=3) == serial
+
+
+def test_interrupted_sweep_resumes(tmp_path, monkeypatch):
+    path = str(tmp_path / "sweep.json")
+    merge = simulate.merge
+    merged = []
+
+    def interrupt_after_two(summary, other):
+        if len(merged) == 2:
+            raise KeyboardInterrupt
+        merged.append(other)
+        merge(summary, other)
+
+    monkeypatch.setattr(simulate, "merge", interrupt_after_two)
+    with pytest.raises(KeyboardInterrupt):  # Like Ctrl+C after two batches: progress is saved on the way out
+        simulate.simulate(SETTINGS, workers=2, checkpoint=path)
+    monkeypatch.setattr(simulate, "merge", merge)
+    completed, partial = simulate.load_checkpoint(path, SETTINGS)
+    assert len(completed) == 2 and partial["matches"] == 2
+
+    assert simulate.simulate(SETTINGS, workers=2, checkpoint=path) == simulate.simulate(SETTINGS, workers=1)
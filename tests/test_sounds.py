@@ -0,0 +1,76 @@
+import threading
+
+import pygame
+import pytest
+
+import sounds
+
+
+def test_get_and_preload_decode_once(monkeypatch):
+    decoding = threading.Event()
+    release = threading.Event()
+    decoded = []
+
+    def slow_sound(path):
+        decoded.append(path)
+        decoding.set()
+        release.wait(5)
+        return object()
+
+    monkeypatch.setattr(sounds.bundle, "sound", lambda path: None)
+    monkeypatch.setattr(sounds.pygame.mixer, "get_init", lambda: True)
+    monkeypatch.setattr(sounds.pygame.mixer, "Sound", slow_sound)
+    bank = sounds.SoundBank()
+
+    results = []
+    caller = threading.Thread(target=lambda: results.append(bank.get("a.ogg")))
+    caller.start()
+    assert decoding.wait(5)
+    worker = bank.preload(["a.ogg", "b.ogg"])  # "a.ogg" is being decoded by get(): only "b.ogg" is queued
+    release.set()
+    caller.join(5)
+    worker.join(5)
+
+    assert sorted(decoded) == ["a.ogg", "b.ogg"]
+    assert results == [bank.get("a.ogg")]
+    assert bank.ready("b.ogg") and not bank.pending
+
+
+def test_get_waits_for_preload(monkeypatch):
+    release = threading.Event()
+    decoded = []
+
+    def slow_sound(path):
+        decoded.append(path)
+        release.wait(5)
+        return object()
+
+    monkeypatch.setattr(sounds.bundle, "sound", lambda path: None)
+    monkeypatch.setattr(sounds.pygame.mixer, "get_init", lambda: True)
+    monkeypatch.setattr(sounds.pygame.mixer, "Sound", slow_sound)
+    bank = sounds.SoundBank()
+
+    worker = bank.preload(["a.ogg"])
+    results = []
+    caller = threading.Thread(target=lambda: results.append(bank.get("a.ogg")))
+    caller.start()
+    release.set()
+    caller.join(5)
+    worker.join(5)
+    assert decoded == ["a.ogg"]
+    assert results == [bank.loaded("a.ogg")]
+
+
+def test_failed_preload_raises_in_get(monkeypatch):
+    def broken(path):
+        raise pygame.error("unsupported format")
+
+    monkeypatch.setattr(sounds.bundle, "sound", lambda path: None)
+    monkeypatch.setattr(sounds.pygame.mixer, "get_init", lambda: True)
+    monkeypatch.setattr(sounds.pygame.mixer, "Sound", broken)
+    bank = sounds.SoundBank()
+    bank.preload(["a.ogg"]).join(5)
+    assert "a.ogg" in bank.failed
+    with pytest.raises(pygame.error):
+        bank.get("a.ogg")
+    assert not bank.pending
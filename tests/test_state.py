@@ -0,0 +1,115 @@
+import pytest
+
+from ai import GreedyPolicy, take_turn
+from engine import Engine, create_roster
+from rng import RandomService
+from state import MatchState, capture, restore
+
+SKIPPED = ("occupancy", "rng", "console", "view", "_image", "abilities", "selected_ability")  # Not plain gameplay values
+
+
+def snapshot(engine):
+    """Everything the rules read, taken straight from the engine's objects (without going through state.py)."""
+    units = tuple(
+        (tuple(sorted((name, value) for name, value in vars(unit).items() if name not in SKIPPED)),
+         unit.selected_ability and unit.selected_ability.name,
+         tuple(ability.remaining_cooldown for ability in unit.abilities))
+        for unit in engine.units
+    )
+    pickup = engine.pickup
+    return {
+        "units": units,
+        "match": (engine.current_unit_index, engine.current_turn, engine.red_barrier, engine.blue_barrier,
+                  engine.keys_initialized, engine.winner),
+        "overlays": tuple(tile.overlay for column in engine.grid.tiles for tile in column),
+        "pickups": (pickup.turn_count, dict(pickup.next_spawn_turns),
+                    sorted((p.x, p.y, p.overlay, p.spawn_turn) for p in pickup.all_pickups), sorted(pickup.by_tile)),
+        "occupancy": {tile: [engine.units.index(unit) for unit in units]
+                      for tile, units in engine.occupancy.cells.items() if units},
+    }
+
+
+def changes(before, after):
+    """What happened between two captures, as the set of things these tests must see restored."""
+    seen = set()
+    for row in range(len(before.ability_counts)):
+        def moved(field):
+            return before.get(row, field) != after.get(row, field)
+        alive_before, alive_after = before.get(row, "alive"), after.get(row, "alive")
+        if alive_before and alive_after and (moved("x") or moved("y")):
+            seen.add("move")
+        if alive_before and not alive_after:
+            seen.add("death")
+        if alive_after and not alive_before:
+            seen.add("respawn")
+        if after.get(row, "is_buffed") or after.get(row, "is_debuffed"):
+            seen.add("buff")
+        if before.keys_initialized and (moved("red_keys") or moved("blue_keys")):
+            seen.add("key transfer")
+    if any(after.cooldowns):
+        seen.add("cooldown")
+    return seen
+
+
+@pytest.fixture(scope="module")
+def match():
+    """A seeded greedy match: (engine at its end, [(capture, snapshot) before every turn], what happened)."""
+    engine = Engine(create_roster(["Garen", "Ashe"], ["Darius", "Soraka"]), rng=RandomService(3))
+    policy = GreedyPolicy(RandomService(3).stream("policy"))
+    history = []
+    seen = set()
+    while engine.winner is None and engine.current_turn <= 300:
+        history.append((capture(engine), snapshot(engine)))
+        take_turn(engine, policy)
+        seen |= changes(history[-1][0], capture(engine))
+    return engine, history, seen
+
+
+def test_match_covers_every_change(match):
+    _, _, seen = match
+    assert seen == {"move", "death", "respawn", "cooldown", "buff", "key transfer"}
+
+
+def test_encode_decode_round_trip(match):
+    _, history, _ = match
+    for state, _ in history:
+        data = state.encode()
+        decoded = MatchState.decode(data)
+        assert decoded == state
+        assert decoded.encode() == data
+
+
+def test_restore_capture_leaves_engine_unchanged(match):
+    engine, history, _ = match
+    before = snapshot(engine)
+    restore(engine, capture(engine))
+    assert snapshot(engine) == before
+
+
+def test_restore_rewinds_engine(match):
+    engine, history, _ = match
+    final = capture(engine)
+    # Going back undoes deaths, respawns, fallen barriers and picked up pickups; going forward redoes them
+    for state, expected in history[::7] + [history[-1]]:
+        restore(engine, state)
+        assert snapshot(engine) == expected
+        restore(engine, capture(engine))
+        assert snapshot(engine) == expected
+    restore(engine, final)
+    assert capture(engine) == final
+
+
+def test_clone_is_independent(match):
+    _, history, _ = match
+    data = history[len(history) // 2][0].encode()
+    original = MatchState.decode(data)
+    clone = original.clone()
+    assert clone == original
+
+    clone.set(0, "health", clone.get(0, "health") + 1)
+    clone.cooldowns[0] += 1
+    assert clone != original
+    assert original.encode() == data
+
+    original.set(1, "mana", original.get(1, "mana") + 1)
+    assert clone.get(1, "mana") != original.get(1, "mana")
@@ -0,0 +1,77 @@
+from ai import GreedyPolicy, take_turn
+from engine import Engine, create_roster
+from rng import RandomService
+from state import capture
+from transposition import ENTRY_BYTES, EVICTION_SAMPLE, EXACT, LOWER, TranspositionTable, ZobristHasher
+
+
+def test_deeper_result_is_kept():
+    table = TranspositionTable(ENTRY_BYTES * 4)
+    table.store("a", 3, 10, EXACT, "deep plan")
+    table.store("a", 1, 99, LOWER, "shallow plan")
+    assert table.probe("a") == (3, 10, EXACT, "deep plan")
+    table.store("a", 3, 20, LOWER, "as deep")
+    assert table.probe("a") == (3, 20, LOWER, "as deep")
+    table.store("a", 5, 30, EXACT, "deeper")
+    assert table.probe("a") == (5, 30, EXACT, "deeper")
+    assert len(table) == 1
+
+
+def test_memory_bound():
+    table = TranspositionTable(ENTRY_BYTES * 10 + ENTRY_BYTES // 2)
+    assert table.capacity == 10
+    for key in range(1000):
+        table.store(key, key % 4, key, EXACT, None)
+        assert len(table) <= table.capacity
+    assert len(table) == 10
+    assert table.evictions == 990
+    assert TranspositionTable(0).capacity == 1
+
+
+def test_evicts_shallowest_of_least_recently_used():
+    capacity = EVICTION_SAMPLE * 2
+    table = TranspositionTable(ENTRY_BYTES * capacity)
+    for key in range(capacity):
+        table.store(key, 1 if key in (2, 3, 12) else 5, key, EXACT, None)
+    # Keys 0 to 7 are the least recently used: the shallowest of them goes, not the oldest
+    table.store("new", 5, 0, EXACT, None)
+    assert table.probe(2) is None
+    assert table.probe(0) is not None
+    # A probe makes an entry recent, taking it out of the sample
+    table.probe(3)
+    table.store("newer", 5, 0, EXACT, None)
+    assert table.probe(3) is not None
+    assert table.probe(1) is None  # As deep as the rest of the sample (0 was probed above), and the oldest
+    assert table.probe(12) is not None  # Shallow, but outside the sample
+    assert table.evictions == 2
+    assert len(table) == capacity
+
+
+def test_counters():
+    table = TranspositionTable(ENTRY_BYTES * 2)
+    assert table.hit_rate() == 0.0
+    table.store("a", 1, 0, EXACT, None)
+    table.store("b", 1, 0, EXACT, None)
+    assert table.probe("a") is not None
+    assert table.probe("c") is None
+    table.store("c", 1, 0, EXACT, None)  # Evicts "b", now the least recently used
+    assert table.probe("b") is None
+    assert (table.probes, table.hits, table.evictions) == (3, 1, 1)
+    assert table.hit_rate() == 1 / 3
+
+
+def test_incremental_hash_matches_full_hash():
+    engine = Engine(create_roster(["Garen", "Ashe"], ["Darius", "Soraka"]), rng=RandomService(5))
+    policy = GreedyPolicy(RandomService(5).stream("policy"))
+    hasher = ZobristHasher()
+    state = capture(engine)
+    key = hasher.hash(state)
+    keys = {key}
+    while engine.winner is None and engine.current_turn <= 120:
+        take_turn(engine, policy)
+        child = capture(engine)
+        key = hasher.update(key, state, child)
+        assert key == hasher.hash(child)
+        keys.add(key)
+        state = child
+    assert len(keys) > 100  # Every turn changes the state, so keys do not collide
@@ -0,0 +1,139 @@
+"""
+Transposition table - Zobrist keys for match states and a size-bounded table of search results keyed by them
+"""
+import random
+from collections import OrderedDict
+from itertools import islice
+
+# Match-level fields of a MatchState that take part in its key (besides every unit field, cooldown and pickup)
+SCALAR_FIELDS = ("current_unit_index", "current_turn", "red_barrier", "blue_barrier", "winner",
+                 "keys_initialized", "pickup_turn", "next_spawn_turns")
+ENTRY_BYTES = 256  # Rough size of one table entry in CPython (key, tuple, plan and OrderedDict overhead)
+EVICTION_SAMPLE = 8  # Least recently used entries looked at to pick the shallowest one to evict
+
+# Bounds stored with a value: it is exact, or the search only proved it is a lower / upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+
+
+class ZobristHasher:
+    """
+    Zobrist hashing of MatchStates: a state's key is the XOR of one random 64-bit number per (slot, value)
+    it holds (unit positions, health, mana, buffs, keys, cooldowns, barriers...). Random numbers are drawn
+    the first time a (slot, value) pair shows up, since health and the turn counter have no fixed range.
+    A child state's key is the parent's with only the changed slots XORed out and in.
+    """
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.keys = {}  # (kind, slot, value) -> random 64-bit number
+
+
+
+
+    def key(self, feature):
+        number = self.keys.get(feature)
+        if number is None:
+            number = self.rng.getrandbits(64)
+            self.keys[feature] = number
+        return number
+
+
+
+
+    def hash(self, state):
+        """Full key of a state."""
+        key = self.key
+        h = 0
+        for slot, value in enumerate(state.units):
+            h ^= key(("unit", slot, value))
+        for slot, value in enumerate(state.cooldowns):
+            h ^= key(("cooldown", slot, value))
+        for name in SCALAR_FIELDS:
+            h ^= key((name, 0, getattr(state, name)))
+        for pickup in state.pickups:
+            h ^= key(("pickup", 0, pickup))
+        return h
+
+
+
+
+    def update(self, h, old, new):
+        """Key of `new`, given `h`, the key of `old`: only what changed is XORed."""
+        key = self.key
+        if old.units != new.units:
+            for slot, (before, after) in enumerate(zip(old.units, new.units)):
+                if before != after:
+                    h ^= key(("unit", slot, before)) ^ key(("unit", slot, after))
+        if old.cooldowns != new.cooldowns:
+            for slot, (before, after) in enumerate(zip(old.cooldowns, new.cooldowns)):
+                if before != after:
+                    h ^= key(("cooldown", slot, before)) ^ key(("cooldown", slot, after))
+        for name in SCALAR_FIELDS:
+            before, after = getattr(old, name), getattr(new, name)
+            if before != after:
+                h ^= key((name, 0, before)) ^ key((name, 0, after))
+        if old.pickups != new.pickups:
+            for pickup in set(old.pickups).symmetric_difference(new.pickups):
+                h ^= key(("pickup", 0, pickup))
+        return h
+
+
+
+
+class TranspositionTable:
+    """
+    Search results by Zobrist key: (depth, value, bound, best plan), within a memory budget.
+    Entries are kept in least-recently-used order; when the table is full, the shallowest of the few
+    least recently used entries is evicted, so deep (expensive) results outlive shallow ones.
+    An existing entry is only overwritten by a result searched at least as deep.
+    """
+    def __init__(self, max_bytes):
+        self.capacity = max(1, max_bytes // ENTRY_BYTES)
+        self.entries = OrderedDict()
+        self.probes = 0
+        self.hits = 0
+        self.evictions = 0
+
+
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+
+
+    def probe(self, key):
+        """Entry stored for `key`, or None."""
+        self.probes += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+
+
+
+    def store(self, key, depth, value, bound, plan):
+        """Record a search result (depth-preferred when the key is already there)."""
+        entries = self.entries
+        existing = entries.get(key)
+        if existing is not None:
+            if depth >= existing[0]:
+                entries[key] = (depth, value, bound, plan)
+            entries.move_to_end(key)
+            return
+        if len(entries) >= self.capacity:
+            oldest = islice(entries.items(), EVICTION_SAMPLE)
+            victim = min(oldest, key=lambda item: item[1][0])[0]
+            del entries[victim]
+            self.evictions += 1
+        entries[key] = (depth, value, bound, plan)
+
+
+
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
@@ -1,19 +1,47 @@
 import pygame
-import random
+import time
 from abilities import DamageHealAbility, BuffAbility, DebuffAbility
-from sounds import Sounds
+from sounds import sound_bank
+from resources import images, atlas, fonts, text_cache
+from rng import random_service
 from constants import *
 from config import CHAMPIONS, MONSTERS, BASES
 
+def ticks():
+    """Milliseconds on a monotonic clock, so combat rules can timestamp damage without pygame."""
+    return int(time.monotonic() * 1000)
+
+class UnitView:
+    """What only the display needs about a unit: eased HP/Mana bars and the floating damage number."""
+    __slots__ = ("displayed_health", "displayed_mana", "last_damage_time", "damage_taken", "damage_taken_type")
+
+    def __init__(self, health, mana):
+        self.displayed_health = float(health)
+        self.displayed_mana = float(mana)
+        self.last_damage_time = None
+        self.damage_taken = 0
+        self.damage_taken_type = "physical"
+
+    def show_damage(self, amount, damage_type):
+        """Start the floating damage (or heal, when negative) number."""
+        self.damage_taken = amount
+        self.damage_taken_type = damage_type
+        self.last_damage_time = ticks()
+
 class Unit:
     """A single unit in the game."""
     def __init__(self, x, y, name, health, damage,physical_defense,magical_defense,crit_chance,image_path, color, move_range, attack_range, unit_type, mana=100, abilities=None):
-        self.x = x
-        self.y = y
+        self._x = x
+        self._y = y
+        self._alive = True
+        self.occupancy = None  # OccupancyIndex told about moves and deaths, once a match tracks this unit
+        self.rng = random_service  # Combat rolls come from its gameplay stream; the match's engine sets its own
+        self.console = print  # Gameplay messages; a match's engine queues them as "console" events instead
         self.initial_x = x  # Initial position for movement range
         self.initial_y = y
         self.name = name
-        self.image = pygame.image.load(image_path)
+        self.image_path = image_path
+        self._image = None  # Loaded on first draw; headless games never need it
         self.color = color
         self.health = health
         self.max_health = health
@@ -26,7 +54,6 @@ class Unit:
         self.move_range = move_range
         self.attack_range = attack_range
         self.unit_type=unit_type   #player or neutral or base_blue or base_red
-        self.alive = True
         self.state = "move"  # "move" or "attack"
         self.selected_ability = None  # Currently selected ability
 
@@ -52,20 +79,75 @@ class Unit:
 
         self.death_timer = 0  # Tracks turns since death
 
-        # Initialize for damage display
-        self.last_damage_time = None
-        self.damage_taken = 0
-        self.damage_taken_type = "physical"
+        # Display-only state (bar animations, damage numbers), kept out of the game state
+        self.view = UnitView(health, mana)
+
+
+
+
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        old_tile = (self._x, self._y)
+        self._x = value
+        if self.occupancy is not None:
+            self.occupancy.moved(self, old_tile, (value, self._y))
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        old_tile = (self._x, self._y)
+        self._y = value
+        if self.occupancy is not None:
+            self.occupancy.moved(self, old_tile, (self._x, value))
+
+    @property
+    def alive(self):
+        return self._alive
+
+    @alive.setter
+    def alive(self, value):
+        if value != self._alive:
+            self._alive = value
+            if self.occupancy is not None:
+                self.occupancy.life_changed(self, value)
+
+
+
+
+    @property
+    def image(self):
+        """The unit's portrait, taken from the shared image registry and registered in the texture atlas on first use."""
+        if self._image is None:
+            self._image = images.load(self.image_path)  # Decoded once per process, shared by every unit
+            atlas.add(self.image_path, self._image)
+        return self._image
+
 
-        # Smooth HP/Mana bar animations
-        self.displayed_health = float(health)
-        self.displayed_mana = float(mana)
 
-        # Movement sounds
-        self.grass_sound = pygame.mixer.Sound(Assets.MOVING)
-        self.grass_sound.set_volume(Volume.MOVEMENT)
-        self.water_sound = pygame.mixer.Sound(Assets.WATER_SOUND)
-        self.water_sound.set_volume(Volume.MOVEMENT)
+
+    def sprite(self, size=(CELL_SIZE, CELL_SIZE)):
+        """The unit's portrait scaled to `size`."""
+        self.image  # Make sure the portrait is registered
+        return atlas.get(self.image_path, size)
+
+
+
+
+    def play_move_sound(self, terrain):
+        """Play the footstep sound for the terrain the unit just stepped on (shared by all units)."""
+        path = {"grass": Assets.MOVING, "water": Assets.WATER_SOUND}.get(terrain)
+        if path:
+            sound = sound_bank.get(path)
+            sound.set_volume(Volume.MOVEMENT)
+            sound.play()
 
 
     @staticmethod
@@ -162,29 +244,24 @@ class Unit:
 
     def move(self, dx, dy, grid):
     
-        """Move the unit if within movement range, traversable, and highlighted."""
+        """
+        Move the unit if the target tile is reachable from where the unit started its turn.
+        :return: True if the unit moved.
+        """
         new_x = self.x + dx
         new_y = self.y + dy
 
         # Check if the current position is within grid bounds
         if 0 <= new_x < len(grid.tiles) and 0 <= new_y < len(grid.tiles[0]):
 
-            # Get the target tile at the new position
-            target_tile = grid.tiles[new_x][new_y]
-
-            # Check if the target tile is highlighted
-            if not target_tile.highlighted:
-                print(f"Cannot move to ({new_x}, {new_y}) because it's not highlighted.")
-                return  # Can't move if the tile is not highlighted
-            # Jouer le son correspondant au type de terrain
+            # Check if the target tile is within this turn's movement range
+            if (new_x, new_y) not in grid.reachable_tiles(self.initial_x, self.initial_y, self.move_range):
+                self.console(f"Cannot move to ({new_x}, {new_y}) because it's out of range.")
+                return False  # Can't move if the tile is not reachable
 
-            else :
-                self.x, self.y = new_x, new_y
-                if target_tile.terrain== "grass":
-                    self.grass_sound.play()
-                    
-                elif target_tile.terrain == "water":
-                    self.water_sound.play()
+            self.x, self.y = new_x, new_y
+            return True
+        return False
 
 
 
@@ -198,9 +275,9 @@ class Unit:
     def attack(self, target,damage,damage_type="physical"):
         multiplyer=1
         #check if it's a damage ability a
-        if random.randint(1, 100) <= self.crit_chance and damage>0:
+        if self.rng.gameplay.randint(1, 100) <= self.crit_chance and damage>0:
             multiplyer = 2  # Double the damage for critical hit
-        print(f"{self.name} attacks {target.name}!")
+        self.console(f"{self.name} attacks {target.name}!")
 
         
         if damage>0:
@@ -214,9 +291,7 @@ class Unit:
         if target.unit_type=="base" and target.barrier_status=="Up":
             damage_after_def=0
         target.health -= damage_after_def  
-        target.damage_taken = damage_after_def 
-        target.damage_taken_type=damage_type
-        target.last_damage_time = pygame.time.get_ticks() 
+        target.view.show_damage(damage_after_def, damage_type)
         if target.health <= 0:
             target.health = 0
             target.alive = False
@@ -231,14 +306,14 @@ class Unit:
             if self.buff_duration > 0:
                 self.buff_duration -= 1
                 if self.buff_duration == 0:
-                    print(f"{self.name}'s buff has expired.")
+                    self.console(f"{self.name}'s buff has expired.")
                     self.revert_buff()
 
             # Handle debuffs
             if self.debuff_duration > 0:
                 self.debuff_duration -= 1
                 if self.debuff_duration == 0:
-                    print(f"{self.name}'s debuff has expired.")
+                    self.console(f"{self.name}'s debuff has expired.")
                     self.revert_debuff()
 
 
@@ -252,7 +327,7 @@ class Unit:
         self.buffed_damage_increase = 0
         self.buffed_defense_increase = 0
         self.is_buffed = False
-        print(f"{self.name}'s stats after buff ended: Damage: {self.damage}, Defense: {self.physical_defense } and {self.physical_defense} ")
+        self.console(f"{self.name}'s stats after buff ended: Damage: {self.damage}, Defense: {self.physical_defense } and {self.physical_defense} ")
 
 
 
@@ -265,7 +340,36 @@ class Unit:
         self.debuffed_attack_reduction = 0
         self.debuffed_defense_reduction = 0
         self.is_debuffed = False
-        print(f"{self.name}'s stats after debuff ended: Damage: {self.damage}, Defense: {self.physical_defense } and {self.physical_defense} ")
+        self.console(f"{self.name}'s stats after debuff ended: Damage: {self.damage}, Defense: {self.physical_defense } and {self.physical_defense} ")
+
+
+
+
+    def update_bars(self):
+        """Ease the displayed HP/Mana towards the real values (once per frame)."""
+        self.view.displayed_health += (self.health - self.view.displayed_health) * UI.HEALTH_BAR_ANIMATION_SPEED
+        self.view.displayed_mana += (self.mana - self.view.displayed_mana) * UI.HEALTH_BAR_ANIMATION_SPEED
+
+
+
+
+    def draw_state(self, is_current_turn):
+        """Snapshot of everything draw() depends on, used to detect when the unit must be redrawn."""
+        health_bar_width = int(CELL_SIZE * (self.view.displayed_health / self.max_health) * UI.HEALTH_BAR_WIDTH_RATIO)
+        damage_tick = None
+        if self.view.damage_taken != 0 and self.view.last_damage_time is not None:
+            time_passed = ticks() - self.view.last_damage_time
+            if time_passed < Gameplay.DAMAGE_DISPLAY_DURATION_MS:
+                damage_tick = time_passed  # Damage text is animating
+        return (self.x, self.y, is_current_turn, self.color, self.health, health_bar_width,
+                self.buff_duration > 0, self.debuff_duration > 0, self.view.damage_taken, damage_tick)
+
+
+
+
+    def draw_bounds(self):
+        """Screen area covered by draw(), including the rising damage text and turn glow."""
+        return pygame.Rect(self.x * CELL_SIZE - 2, self.y * CELL_SIZE - 12, CELL_SIZE + 4, CELL_SIZE + 14)
 
 
 
@@ -273,14 +377,10 @@ class Unit:
     def draw(self, screen, is_current_turn):
         # Draw the unit's image inside the square
         rect = pygame.Rect(self.x * CELL_SIZE, self.y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-        screen.blit(pygame.transform.scale(self.image, (CELL_SIZE, CELL_SIZE)), rect)
-
-        # Smooth HP/Mana bar animation
-        self.displayed_health += (self.health - self.displayed_health) * UI.HEALTH_BAR_ANIMATION_SPEED
-        self.displayed_mana += (self.mana - self.displayed_mana) * UI.HEALTH_BAR_ANIMATION_SPEED
+        screen.blit(self.sprite(), rect)
 
         # Health bar settings
-        health_ratio = self.displayed_health / self.max_health
+        health_ratio = self.view.displayed_health / self.max_health
         health_bar_full_width = int(CELL_SIZE * UI.HEALTH_BAR_WIDTH_RATIO)
         health_bar_width = int(CELL_SIZE * health_ratio * UI.HEALTH_BAR_WIDTH_RATIO)
         health_bar_height = UI.HEALTH_BAR_HEIGHT
@@ -327,8 +427,8 @@ class Unit:
         screen.blit(gloss_surface, (health_bar_x + 1, health_bar_y + 1))
 
         # Draw damage text with a black boundary
-        if hasattr(self, "last_damage_time") and hasattr(self, "damage_taken") and self.damage_taken != 0:
-            time_passed = pygame.time.get_ticks() - self.last_damage_time
+        if self.view.damage_taken != 0:
+            time_passed = ticks() - self.view.last_damage_time
 
             if time_passed < Gameplay.DAMAGE_DISPLAY_DURATION_MS:
                 # Calculate alpha (opacity) and vertical position
@@ -336,13 +436,13 @@ class Unit:
                 offset_y = -time_passed // UI.DAMAGE_TEXT_RISE_RATE + 15
 
                 # Determine flash color based on damage type
-                if self.damage_taken > 0:
+                if self.view.damage_taken > 0:
                     A = 255
                 else:
                     A = 0
 
                 # Purple for magical damage, red for physical
-                if self.damage_taken_type == "magical":
+                if self.view.damage_taken_type == "magical":
                     B = 255
                 else:
                     B = 0
@@ -353,18 +453,13 @@ class Unit:
                     screen.blit(flash_overlay, rect)
 
                 # Create the text surface with fading effect
-                font = pygame.font.Font(Assets.FONT_RUSSO, UI.DAMAGE_TEXT_SIZE)
-                if self.damage_taken>0:
-                    text_surface = font.render(f"-{abs(self.damage_taken)}", True, (A, 255-A, B))
-                    outline_surface = font.render(f"-{abs(self.damage_taken)}", True, (0, 0, 0))
+                font = fonts.get(Assets.FONT_RUSSO, UI.DAMAGE_TEXT_SIZE)
+                if self.view.damage_taken>0:
+                    text_surface = text_cache.render(font, f"-{abs(self.view.damage_taken)}", (A, 255-A, B), alpha=alpha)
+                    outline_surface = text_cache.render(font, f"-{abs(self.view.damage_taken)}", (0, 0, 0), alpha=alpha)
                 else:
-                    text_surface = font.render(f"+{abs(self.damage_taken)}", True, (A, 255-A, 0))
-                    outline_surface = font.render(f"+{abs(self.damage_taken)}", True, (0, 0, 0))
-                text_surface.set_alpha(alpha)
-
-                # Add a black outline
-                #outline_surface = font.render(f"-{abs(self.damage_taken)}", True, (0, 0, 0))
-                outline_surface.set_alpha(alpha)
+                    text_surface = text_cache.render(font, f"+{abs(self.view.damage_taken)}", (A, 255-A, 0), alpha=alpha)
+                    outline_surface = text_cache.render(font, f"+{abs(self.view.damage_taken)}", (0, 0, 0), alpha=alpha)
 
                 # Draw the outline slightly offset in each direction
                 x = self.x * CELL_SIZE + CELL_SIZE // 2 - text_surface.get_width() // 2
@@ -376,7 +471,7 @@ class Unit:
                 screen.blit(text_surface, (x, y))
             else:
                 # Clear the damage_taken attribute after animation ends
-                self.damage_taken = 0
+                self.view.damage_taken = 0
 
         # Draw upward arrow if buffed and duration > 0
         if self.buff_duration > 0:
@@ -425,16 +520,31 @@ class BaseUnit(Unit):
 
 
 
+    def draw_state(self, is_current_turn):
+        """Include the barrier status shown above the Nexus."""
+        return super().draw_state(is_current_turn) + (self.barrier_status,)
+
+
+
+
+    def draw_bounds(self):
+        """Include the barrier status text drawn above the Nexus."""
+        return super().draw_bounds().union(
+            pygame.Rect(self.x * CELL_SIZE + CELL_SIZE // 2 - 60, self.y * CELL_SIZE - 20, 120, 20))
+
+
+
+
     def draw(self, screen, is_current_turn):
         """Draw the Nexus along with its barrier status."""
         # Call the parent draw method
         super().draw(screen, is_current_turn)
 
         # Draw barrier status text above the Nexus
-        font = pygame.font.Font(None, 24)
+        font = fonts.get(None, 24)
         barrier_status_text = "Barrier: UP" if self.barrier_status == "Up" else "Barrier: DOWN"
         color = Colors.GREEN if self.barrier_status == "Up" else Colors.RED
-        text_surface = font.render(barrier_status_text, True, color)
+        text_surface = text_cache.render(font, barrier_status_text, color)
         x = self.x * CELL_SIZE + CELL_SIZE // 2 - text_surface.get_width() // 2
         y = self.y * CELL_SIZE - 20
         screen.blit(text_surface, (x, y))
\ No newline at end of file